@@ -0,0 +1,18 @@
+-- Delete a project only when no sources reference it, in a single round-trip.
+-- Returns 'deleted', 'has_sources', or 'not_found'.
+create or replace function public.delete_project_if_no_sources(target_project_key text)
+returns text
+language plpgsql
+as $$
+begin
+  perform 1 from projects where project_key = target_project_key for update;
+  if not found then
+    return 'not_found';
+  end if;
+  if exists (select 1 from sources where project_key = target_project_key) then
+    return 'has_sources';
+  end if;
+  delete from projects where project_key = target_project_key;
+  return 'deleted';
+end;
+$$;
@@ -0,0 +1,81 @@
+-- Store chunk embeddings as half-precision vectors (pgvector >= 0.7): half the
+-- storage and half the bytes read per distance computation, with negligible
+-- recall loss for text-embedding-3-small.
+-- Any existing index on chunks.embedding must be dropped before the type change.
+drop index if exists chunks_embedding_hnsw_idx;
+
+alter table chunks
+  alter column embedding type halfvec(1536) using embedding::halfvec(1536);
+
+-- match_chunks orders by L2 distance (<->), so the index uses the matching opclass.
+create index if not exists chunks_embedding_hnsw_idx
+  on chunks using hnsw (embedding halfvec_l2_ops);
+
+-- Same signature as before (callers still send a float array); the query
+-- vector is cast once to halfvec to compare against the stored column.
+create or replace function public.match_chunks(
+  query_embedding vector(1536),
+  match_count int,
+  source_filter uuid default null,
+  agent_filter text[] default null,
+  scope_mode text default 'hybrid',
+  project_key_filter text default null
+)
+returns table (
+  source_id uuid,
+  chunk_index int,
+  content text,
+  distance float4,
+  title text,
+  scope text,
+  project_key text
+)
+language sql
+as $$
+  select
+    chunks.source_id,
+    chunks.chunk_index,
+    chunks.content,
+    (chunks.embedding <-> query_embedding::halfvec(1536)) as distance,
+    sources.title,
+    chunks.scope,
+    chunks.project_key
+  from chunks
+  join sources on sources.id = chunks.source_id
+  where chunks.embedding is not null
+    and (source_filter is null or chunks.source_id = source_filter)
+    and (
+      agent_filter is null
+      or (sources.agent_ids is not null and sources.agent_ids && agent_filter)
+      or (sources.agent_id is not null and sources.agent_id = any(agent_filter))
+    )
+    and (
+      (scope_mode = 'generic' and chunks.scope = 'generic')
+      or (
+        scope_mode = 'project'
+        and chunks.scope = 'project'
+        and project_key_filter is not null
+        and lower(chunks.project_key) = lower(project_key_filter)
+      )
+      or (
+        scope_mode = 'hybrid'
+        and (
+          chunks.scope = 'generic'
+          or (
+            chunks.scope = 'project'
+            and (
+              project_key_filter is null
+              or (project_key_filter is not null and lower(chunks.project_key) = lower(project_key_filter))
+            )
+          )
+        )
+      )
+    )
+  order by
+    (chunks.embedding <-> query_embedding::halfvec(1536))
+    - case
+        when scope_mode = 'hybrid' and chunks.scope = 'project' then 0.02
+        else 0
+      end
+  limit match_count;
+$$;
@@ -0,0 +1,19 @@
+-- Rebuild the embedding index with denser graph parameters for larger chunk
+-- tables (pgvector defaults are m=16, ef_construction=64).
+-- Lower maintenance_work_mem on small instances; the build spills to disk if it runs out.
+set maintenance_work_mem = '2GB';
+set max_parallel_maintenance_workers = 7;
+
+drop index if exists chunks_embedding_hnsw_idx;
+create index chunks_embedding_hnsw_idx
+  on chunks using hnsw (embedding halfvec_l2_ops)
+  with (m = 24, ef_construction = 128);
+
+reset maintenance_work_mem;
+reset max_parallel_maintenance_workers;
+
+-- PostgREST runs each RPC on a pooled connection, so a separate "set ef_search"
+-- call would not reach the search. Attach the setting to match_chunks instead;
+-- it applies for the duration of every call.
+alter function public.match_chunks(vector, int, uuid, text[], text, text)
+  set hnsw.ef_search = 100;
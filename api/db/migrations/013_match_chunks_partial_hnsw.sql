@@ -0,0 +1,116 @@
+-- Per-scope partial HNSW indexes so scope filtering happens inside the index
+-- scan instead of post-filtering a global top-k (low recall) or falling back
+-- to an exact scan (slow). Requires pgvector >= 0.8 for iterative scans.
+set maintenance_work_mem = '2GB';
+set max_parallel_maintenance_workers = 7;
+
+create index if not exists chunks_embedding_hnsw_generic_idx
+  on chunks using hnsw (embedding halfvec_l2_ops)
+  with (m = 24, ef_construction = 128)
+  where scope = 'generic';
+
+create index if not exists chunks_embedding_hnsw_project_idx
+  on chunks using hnsw (embedding halfvec_l2_ops)
+  with (m = 24, ef_construction = 128)
+  where scope = 'project';
+
+reset maintenance_work_mem;
+reset max_parallel_maintenance_workers;
+
+-- Every search now targets one of the partial indexes.
+drop index if exists chunks_embedding_hnsw_idx;
+
+-- Exact pre-filter for selective project lookups (match_chunks compares lower()).
+create index if not exists chunks_project_key_lower_idx
+  on chunks (lower(project_key))
+  where scope = 'project';
+
+-- Each scope gets its own distance-ordered top-k so the planner can walk the
+-- matching partial index; hybrid results are merged and re-ranked afterwards.
+-- The hybrid project boost is constant within a scope, so the merged top-k is
+-- identical to ranking all candidates together.
+create or replace function public.match_chunks(
+  query_embedding vector(1536),
+  match_count int,
+  source_filter uuid default null,
+  agent_filter text[] default null,
+  scope_mode text default 'hybrid',
+  project_key_filter text default null
+)
+returns table (
+  source_id uuid,
+  chunk_index int,
+  content text,
+  distance float4,
+  title text,
+  scope text,
+  project_key text
+)
+language sql
+set hnsw.ef_search = 100
+set hnsw.iterative_scan = 'relaxed_order'
+as $$
+  with generic_hits as materialized (
+    select
+      chunks.source_id,
+      chunks.chunk_index,
+      chunks.content,
+      (chunks.embedding <-> query_embedding::halfvec(1536)) as distance,
+      sources.title,
+      chunks.scope,
+      chunks.project_key
+    from chunks
+    join sources on sources.id = chunks.source_id
+    where scope_mode in ('generic', 'hybrid')
+      and chunks.scope = 'generic'
+      and chunks.embedding is not null
+      and (source_filter is null or chunks.source_id = source_filter)
+      and (
+        agent_filter is null
+        or (sources.agent_ids is not null and sources.agent_ids && agent_filter)
+        or (sources.agent_id is not null and sources.agent_id = any(agent_filter))
+      )
+    order by chunks.embedding <-> query_embedding::halfvec(1536)
+    limit match_count
+  ),
+  project_hits as materialized (
+    select
+      chunks.source_id,
+      chunks.chunk_index,
+      chunks.content,
+      (chunks.embedding <-> query_embedding::halfvec(1536)) as distance,
+      sources.title,
+      chunks.scope,
+      chunks.project_key
+    from chunks
+    join sources on sources.id = chunks.source_id
+    where scope_mode in ('project', 'hybrid')
+      and chunks.scope = 'project'
+      and chunks.embedding is not null
+      and (
+        (project_key_filter is not null and lower(chunks.project_key) = lower(project_key_filter))
+        or (scope_mode = 'hybrid' and project_key_filter is null)
+      )
+      and (source_filter is null or chunks.source_id = source_filter)
+      and (
+        agent_filter is null
+        or (sources.agent_ids is not null and sources.agent_ids && agent_filter)
+        or (sources.agent_id is not null and sources.agent_id = any(agent_filter))
+      )
+    order by chunks.embedding <-> query_embedding::halfvec(1536)
+    limit match_count
+  )
+  select hits.*
+  from (
+    select * from generic_hits
+    union all
+    select * from project_hits
+  ) hits
+  order by
+    hits.distance
+    - case
+        when scope_mode = 'hybrid' and hits.scope = 'project' then 0.02
+        else 0
+      end
+  limit match_count;
+$$;
@@ -0,0 +1,141 @@
+-- Two-stage retrieval: a Hamming-distance HNSW scan over binary-quantized
+-- embeddings picks candidates, then exact halfvec L2 distance re-ranks them.
+-- The bit index is ~1/16 the size of the halfvec index it replaces.
+alter table chunks
+  add column if not exists embedding_bits bit(1536)
+  generated always as (binary_quantize(embedding)::bit(1536)) stored;
+
+set maintenance_work_mem = '2GB';
+set max_parallel_maintenance_workers = 7;
+
+create index if not exists chunks_embedding_bits_generic_idx
+  on chunks using hnsw (embedding_bits bit_hamming_ops)
+  with (m = 24, ef_construction = 128)
+  where scope = 'generic';
+
+create index if not exists chunks_embedding_bits_project_idx
+  on chunks using hnsw (embedding_bits bit_hamming_ops)
+  with (m = 24, ef_construction = 128)
+  where scope = 'project';
+
+reset maintenance_work_mem;
+reset max_parallel_maintenance_workers;
+
+-- Re-ranking reads the halfvec column directly, so its graph indexes are no longer used.
+drop index if exists chunks_embedding_hnsw_generic_idx;
+drop index if exists chunks_embedding_hnsw_project_idx;
+
+-- Stage 1 takes up to 200 Hamming-nearest candidates per scope; stage 2 keeps
+-- the per-scope top match_count by exact distance; hybrid results are merged
+-- and re-ranked with the project boost as before.
+create or replace function public.match_chunks(
+  query_embedding vector(1536),
+  match_count int,
+  source_filter uuid default null,
+  agent_filter text[] default null,
+  scope_mode text default 'hybrid',
+  project_key_filter text default null
+)
+returns table (
+  source_id uuid,
+  chunk_index int,
+  content text,
+  distance float4,
+  title text,
+  scope text,
+  project_key text
+)
+language sql
+set hnsw.ef_search = 200
+set hnsw.iterative_scan = 'relaxed_order'
+as $$
+  with generic_candidates as materialized (
+    select
+      chunks.source_id,
+      chunks.chunk_index,
+      chunks.content,
+      chunks.embedding,
+      sources.title,
+      chunks.scope,
+      chunks.project_key
+    from chunks
+    join sources on sources.id = chunks.source_id
+    where scope_mode in ('generic', 'hybrid')
+      and chunks.scope = 'generic'
+      and chunks.embedding is not null
+      and (source_filter is null or chunks.source_id = source_filter)
+      and (
+        agent_filter is null
+        or (sources.agent_ids is not null and sources.agent_ids && agent_filter)
+        or (sources.agent_id is not null and sources.agent_id = any(agent_filter))
+      )
+    order by chunks.embedding_bits <~> binary_quantize(query_embedding)::bit(1536)
+    limit greatest(200, match_count)
+  ),
+  project_candidates as materialized (
+    select
+      chunks.source_id,
+      chunks.chunk_index,
+      chunks.content,
+      chunks.embedding,
+      sources.title,
+      chunks.scope,
+      chunks.project_key
+    from chunks
+    join sources on sources.id = chunks.source_id
+    where scope_mode in ('project', 'hybrid')
+      and chunks.scope = 'project'
+      and chunks.embedding is not null
+      and (
+        (project_key_filter is not null and lower(chunks.project_key) = lower(project_key_filter))
+        or (scope_mode = 'hybrid' and project_key_filter is null)
+      )
+      and (source_filter is null or chunks.source_id = source_filter)
+      and (
+        agent_filter is null
+        or (sources.agent_ids is not null and sources.agent_ids && agent_filter)
+        or (sources.agent_id is not null and sources.agent_id = any(agent_filter))
+      )
+    order by chunks.embedding_bits <~> binary_quantize(query_embedding)::bit(1536)
+    limit greatest(200, match_count)
+  ),
+  generic_hits as (
+    select
+      source_id,
+      chunk_index,
+      content,
+      (embedding <-> query_embedding::halfvec(1536)) as distance,
+      title,
+      scope,
+      project_key
+    from generic_candidates
+    order by distance
+    limit match_count
+  ),
+  project_hits as (
+    select
+      source_id,
+      chunk_index,
+      content,
+      (embedding <-> query_embedding::halfvec(1536)) as distance,
+      title,
+      scope,
+      project_key
+    from project_candidates
+    order by distance
+    limit match_count
+  )
+  select hits.*
+  from (
+    select * from generic_hits
+    union all
+    select * from project_hits
+  ) hits
+  order by
+    hits.distance
+    - case
+        when scope_mode = 'hybrid' and hits.scope = 'project' then 0.02
+        else 0
+      end
+  limit match_count;
+$$;
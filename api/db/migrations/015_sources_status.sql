@@ -0,0 +1,11 @@
+alter table sources
+  add column if not exists status text not null default 'ready',
+  add column if not exists error text;
+
+do $$
+begin
+  if not exists (select 1 from pg_constraint where conname = 'sources_status_check') then
+    alter table sources
+      add constraint sources_status_check check (status in ('pending', 'ready', 'failed'));
+  end if;
+end $$;
@@ -1,11 +1,10 @@
 import re
-from datetime import datetime
 from pathlib import Path
 from typing import Optional, Tuple
 
 from docx import Document
 
-from pdf_export import get_doc_output_dir
+from pdf_export import content_too_large, resolved_doc_output_dir, utc_timestamp
 
 MAX_FILENAME_LEN = 120
 ALLOWED_FILENAME_RE = re.compile(r"[^a-zA-Z0-9\-_. ]+")
@@ -33,12 +32,11 @@ def build_docx_filename(title: str) -> str:
     base = re.sub(r"_+", "_", base).strip("_")
     if not base:
         base = "document"
-    timestamp = datetime.utcnow().strftime("%Y-%m-%d_%H%M%S")
-    return sanitize_docx_filename(f"{base}_{timestamp}.docx")
+    return sanitize_docx_filename(f"{base}_{utc_timestamp()}.docx")
 
 
 def ensure_docx_output_path(filename: str, project_key: Optional[str] = None) -> Path:
-    output_dir = get_doc_output_dir(project_key).resolve()
+    output_dir = resolved_doc_output_dir(project_key)
     candidate = (output_dir / filename).resolve()
     if output_dir not in candidate.parents and candidate != output_dir:
         raise ValueError("Invalid filename path.")
@@ -76,6 +74,8 @@ def write_docx(
 ) -> Tuple[str, Path]:
     safe_name = sanitize_docx_filename(filename)
     output_path = ensure_docx_output_path(safe_name, project_key)
+    # The output folder path is cached, so recreate it if it was removed since.
+    output_path.parent.mkdir(parents=True, exist_ok=True)
 
     document = Document()
     document.add_heading(title, level=1)
@@ -96,7 +96,7 @@ def run_export_docx_tool(args: dict) -> dict:
         raise ValueError("Tool arg 'title' is required.")
     if not content:
         raise ValueError("Tool arg 'content' is required.")
-    if len(content.encode("utf-8")) > 2 * 1024 * 1024:
+    if content_too_large(content):
         raise ValueError("Tool arg 'content' exceeds 2MB limit.")
 
     final_filename = filename or build_docx_filename(title)
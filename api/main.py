@@ -1,7 +1,11 @@
 import json
+import logging
 import os
+import queue
 import re
 import traceback
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime, timezone
 import sys
 from pathlib import Path
@@ -11,6 +15,8 @@ from uuid import UUID
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES
 from fastapi.responses import StreamingResponse
 from openai import OpenAI
 from pydantic import BaseModel, Field
@@ -28,11 +34,12 @@ from docx_export import run_export_docx_tool
 from xlsx_export import run_export_xlsx_tool
 from pdf_routes import pdf_router
 from rag import (
-    get_default_project_key_value,
-    get_supabase_client,
-    get_project_display_name,
+    get_async_supabase_client,
+    get_default_project_key_async,
+    get_project_display_name_async,
     retrieve_chunks,
     resolve_scope_and_project_key,
+    shutdown_pdf_executor,
 )
 from projects import projects_router
 from rag_routes import rag_router
@@ -42,7 +49,31 @@ from skills_loader import build_available_skills_xml, get_skill_content
 _env_file = ".env" if sys.platform == "win32" else "env"
 load_dotenv(Path(__file__).parent / _env_file)
 
-app = FastAPI()
+
+def _start_log_listener() -> tuple[QueueHandler, QueueListener]:
+    """Route log records through a queue so handler I/O runs on a background thread."""
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    listener = QueueListener(log_queue, stream_handler)
+    queue_handler = QueueHandler(log_queue)
+    logging.getLogger().addHandler(queue_handler)
+    listener.start()
+    return queue_handler, listener
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    queue_handler, listener = _start_log_listener()
+    try:
+        yield
+    finally:
+        shutdown_pdf_executor()
+        logging.getLogger().removeHandler(queue_handler)
+        listener.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -51,6 +82,18 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Compress larger JSON bodies such as /rag/retrieve and /rag/sources. SSE and /downloads/ files are
+# left alone: PDFs gain little, DOCX/XLSX are already zip archives, and gzip would drop Content-Length.
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=1024,
+    exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES
+    + (
+        "application/pdf",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ),
+)
 
 
 class ChatMessage(BaseModel):
@@ -309,8 +352,8 @@ async def chat_stream(body: ChatRequest) -> StreamingResponse:
             current_project_name = "Unspecified"
             project_key_for_prompt = ""
             if body.rag and body.rag.project_key:
-                supabase = get_supabase_client()
-                resolved_name = get_project_display_name(supabase, body.rag.project_key)
+                supabase = await get_async_supabase_client()
+                resolved_name = await get_project_display_name_async(supabase, body.rag.project_key)
                 if resolved_name:
                     current_project_name = resolved_name
                 project_key_for_prompt = body.rag.project_key
@@ -337,15 +380,18 @@ async def chat_stream(body: ChatRequest) -> StreamingResponse:
                     agent_filter = rag_options.agent_ids
                     if not agent_filter:
                         agent_filter = [rag_options.agent_id or agent_id]
+                    rag_supabase = await get_async_supabase_client()
                     try:
-                        rag_scope, rag_project_key = resolve_scope_and_project_key(
+                        rag_scope, rag_project_key = await resolve_scope_and_project_key(
+                            rag_supabase,
                             rag_options.scope,
                             rag_options.project_key,
                         )
                     except Exception:
                         rag_scope, rag_project_key = "generic", None
-                    tool_project_key = rag_project_key or get_default_project_key_value()
-                    retrieved = retrieve_chunks(
+                    tool_project_key = rag_project_key or await get_default_project_key_async(rag_supabase)
+                    retrieved = await retrieve_chunks(
+                        rag_supabase,
                         rag_query,
                         rag_options.top_k,
                         rag_options.source_id,
@@ -1,8 +1,11 @@
 import os
 import re
-from datetime import datetime
+import string
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Optional, Tuple
+from typing import BinaryIO, Iterable, Optional, Tuple, Union
 
 from reportlab.lib.pagesizes import LETTER
 from reportlab.pdfbase.pdfmetrics import stringWidth
@@ -11,10 +14,27 @@ from reportlab.pdfgen import canvas
 from rag import require_project_path, resolve_project_path
 
 MAX_FILENAME_LEN = 120
+MAX_CONTENT_BYTES = 2 * 1024 * 1024
 ALLOWED_FILENAME_RE = re.compile(r"[^a-zA-Z0-9\-_. ]+")
-ALLOWED_DOWNLOAD_RE = re.compile(r"^[a-zA-Z0-9._-]+$")
+_ALLOWED_FILENAME_CHARS = frozenset(string.ascii_letters + string.digits + "-_. ")
+ALLOWED_DOWNLOAD_RE = re.compile(r"[a-zA-Z0-9._-]+")
+_ALLOWED_DOWNLOAD_FULLMATCH = ALLOWED_DOWNLOAD_RE.fullmatch
+# Whole download-name grammar: allowed characters, no "..", .pdf or .docx extension.
+_VALID_DOWNLOAD_FULLMATCH = re.compile(
+    r"(?:[A-Za-z0-9_-]|\.(?!\.))*\.(?:pdf|docx)",
+    re.ASCII | re.IGNORECASE,
+).fullmatch
+_PATH_SEPARATORS = ("/", "\\", ":")
+# Absorbs float drift from summing per-character widths.
+WIDTH_EPSILON = 1e-6
 
+_RESOLVED_OUTPUT: dict[Optional[str], Path] = {}
+_RESOLVED_GEN: dict[Optional[str], Path] = {}
+# Glyph widths per (char, font, size), shared by every export in the process.
+_CHAR_WIDTHS: dict[Tuple[str, str, int], float] = {}
 
+
+@lru_cache(maxsize=32)
 def get_doc_output_dir(project_key: Optional[str] = None) -> Path:
     raw = os.getenv("DOC_OUTPUT_DIR")
     if not raw:
@@ -29,6 +49,22 @@ def get_doc_output_dir(project_key: Optional[str] = None) -> Path:
     return output_dir
 
 
+def resolved_doc_output_dir(project_key: Optional[str] = None) -> Path:
+    output_dir = _RESOLVED_OUTPUT.get(project_key)
+    if output_dir is None:
+        output_dir = get_doc_output_dir(project_key).resolve()
+        _RESOLVED_OUTPUT[project_key] = output_dir
+    return output_dir
+
+
+def clear_output_dir_cache() -> None:
+    """Forget cached output directories after a project path or the default project changes."""
+    resolve_project_path.cache_clear()
+    get_doc_output_dir.cache_clear()
+    _RESOLVED_OUTPUT.clear()
+    _RESOLVED_GEN.clear()
+
+
 def get_gen_output_dir(project_key: Optional[str] = None) -> Path:
     """Output directory for generated files (e.g. spreadsheets from xlsx skill): current project / gen."""
     project_dir = require_project_path(project_key) if project_key else resolve_project_path(project_key)
@@ -40,10 +76,19 @@ def get_gen_output_dir(project_key: Optional[str] = None) -> Path:
     return output_dir
 
 
+def resolved_gen_output_dir(project_key: Optional[str] = None) -> Path:
+    output_dir = _RESOLVED_GEN.get(project_key)
+    if output_dir is None:
+        output_dir = get_gen_output_dir(project_key).resolve()
+        _RESOLVED_GEN[project_key] = output_dir
+    return output_dir
+
+
 def sanitize_filename(value: str) -> str:
     cleaned = value.replace("\\", "_").replace("/", "_").strip()
     cleaned = cleaned.replace("..", "_")
-    cleaned = ALLOWED_FILENAME_RE.sub("_", cleaned)
+    if not _ALLOWED_FILENAME_CHARS.issuperset(cleaned):
+        cleaned = ALLOWED_FILENAME_RE.sub("_", cleaned)
     cleaned = cleaned.strip(" .")
     if not cleaned:
         cleaned = "document"
@@ -55,19 +100,46 @@ def sanitize_filename(value: str) -> str:
     return cleaned
 
 
+@lru_cache(maxsize=4)
+def _ts(sec: int) -> str:
+    return datetime.fromtimestamp(sec, tz=timezone.utc).strftime("%Y-%m-%d_%H%M%S")
+
+
+def utc_timestamp() -> str:
+    """Current UTC time as used in export filenames (YYYY-MM-DD_HHMMSS)."""
+    return _ts(int(time.time()))
+
+
 def build_filename(title: str) -> str:
     base = title.strip() or "document"
     base = base.lower().replace(" ", "_")
-    base = ALLOWED_FILENAME_RE.sub("_", base)
-    base = re.sub(r"_+", "_", base).strip("_")
+    if not _ALLOWED_FILENAME_CHARS.issuperset(base):
+        base = ALLOWED_FILENAME_RE.sub("_", base)
+    if "__" in base:
+        base = re.sub(r"_+", "_", base)
+    base = base.strip("_")
     if not base:
         base = "document"
-    timestamp = datetime.utcnow().strftime("%Y-%m-%d_%H%M%S")
+    timestamp = utc_timestamp()
     return sanitize_filename(f"{base}_{timestamp}.pdf")
 
 
 def ensure_output_path(filename: str, project_key: Optional[str] = None) -> Path:
-    output_dir = get_doc_output_dir(project_key).resolve()
+    """Target path for writing an export; see get_download_path for serving existing files."""
+    output_dir = resolved_doc_output_dir(project_key)
+    # Sanitized names are a single plain component; join them directly.
+    if filename not in ("", ".", "..") and not any(sep in filename for sep in _PATH_SEPARATORS):
+        return output_dir / filename
+    candidate = os.path.normpath(os.path.join(output_dir, filename))
+    if os.path.commonpath([str(output_dir), candidate]) != str(output_dir):
+        raise ValueError("Invalid filename path.")
+    return Path(candidate)
+
+
+def get_download_path(filename: str, project_key: Optional[str] = None) -> Path:
+    """Resolve a validated .pdf/.docx name in the output folder (for download)."""
+    output_dir = resolved_doc_output_dir(project_key)
+    # Resolve so a symlink in the output folder cannot point the download outside it.
     candidate = (output_dir / filename).resolve()
     if output_dir not in candidate.parents and candidate != output_dir:
         raise ValueError("Invalid filename path.")
@@ -76,6 +148,9 @@ def ensure_output_path(filename: str, project_key: Optional[str] = None) -> Path
 
 def validate_download_filename(filename: str) -> str:
     cleaned = filename.strip()
+    if len(cleaned) <= MAX_FILENAME_LEN and _VALID_DOWNLOAD_FULLMATCH(cleaned):
+        return cleaned
+    # Slow path only decides which error to report.
     if not cleaned:
         raise ValueError("Filename is required.")
     if "/" in cleaned or "\\" in cleaned or ":" in cleaned:
@@ -84,52 +159,96 @@ def validate_download_filename(filename: str) -> str:
         raise ValueError("Invalid filename.")
     if not cleaned.lower().endswith((".pdf", ".docx")):
         raise ValueError("Only .pdf or .docx files are allowed.")
-    if not ALLOWED_DOWNLOAD_RE.match(cleaned):
+    if not _ALLOWED_DOWNLOAD_FULLMATCH(cleaned):
         raise ValueError("Filename contains invalid characters.")
     if len(cleaned) > MAX_FILENAME_LEN:
         raise ValueError("Filename is too long.")
     return cleaned
 
 
-def _wrap_line(line: str, font_name: str, font_size: int, max_width: float) -> Iterable[str]:
-    if not line:
-        return [""]
+def content_too_large(content: str, limit: int = MAX_CONTENT_BYTES) -> bool:
+    # UTF-8 uses 1-4 bytes per character, so only encode when the length alone can't decide.
+    size = len(content)
+    if size > limit:
+        return True
+    if size * 4 <= limit:
+        return False
+    return len(content.encode("utf-8")) > limit
+
+
+def _char_width(ch: str, font_name: str, font_size: int) -> float:
+    key = (ch, font_name, font_size)
+    width = _CHAR_WIDTHS.get(key)
+    if width is None:
+        width = stringWidth(ch, font_name, font_size)
+        _CHAR_WIDTHS[key] = width
+    return width
+
+
+def _measure_words(
+    line: str,
+    font_name: str,
+    font_size: int,
+    word_w: dict[str, float],
+) -> Tuple[list[str], list[float]]:
     words = line.split()
-    current = []
+    widths = []
     for word in words:
-        test = " ".join([*current, word]) if current else word
-        if stringWidth(test, font_name, font_size) <= max_width:
-            current.append(word)
-            continue
-        if current:
-            yield " ".join(current)
-        current = [word]
-    if current:
-        yield " ".join(current)
+        width = word_w.get(word)
+        if width is None:
+            width = sum(_char_width(ch, font_name, font_size) for ch in word)
+            word_w[word] = width
+        widths.append(width)
+    return words, widths
 
 
-def _wrap_text(text: str, font_name: str, font_size: int, max_width: float) -> Iterable[str]:
-    for line in text.splitlines():
-        for wrapped in _wrap_line(line, font_name, font_size, max_width):
-            yield wrapped
+def _wrap_line(words: list[str], widths: list[float], space_w: float, max_width: float) -> Iterable[str]:
+    # Minimum-raggedness line breaking: choose breaks that minimise the sum of
+    # squared trailing slack over all lines but the last.
+    if not words:
+        return
+    limit = max_width + WIDTH_EPSILON
+    count = len(words)
+    best = [0.0] * (count + 1)
+    breaks = [count] * (count + 1)
+    for i in range(count - 1, -1, -1):
+        width = widths[i]
+        best[i] = float("inf")
+        for j in range(i + 1, count + 1):
+            if j > i + 1:
+                width += space_w + widths[j - 1]
+                if width > limit:
+                    break
+            # A single word wider than the line keeps its own line.
+            slack = max(max_width - width, 0.0)
+            cost = best[j] + (0.0 if j == count else slack * slack)
+            if cost < best[i]:
+                best[i] = cost
+                breaks[i] = j
+    i = 0
+    while i < count:
+        j = breaks[i]
+        yield " ".join(words[i:j])
+        i = j
 
 
-def write_pdf(
-    title: str,
-    content: str,
-    filename: str,
-    project_key: Optional[str] = None,
-) -> Tuple[str, Path]:
-    safe_name = sanitize_filename(filename)
-    output_path = ensure_output_path(safe_name, project_key)
+def _wrap_text(text: str, font_name: str, font_size: int, max_width: float) -> Iterable[str]:
+    # Tokenize and measure every paragraph up front; repeated words are measured once.
+    word_w: dict[str, float] = {}
+    space_w = _char_width(" ", font_name, font_size)
+    measured = [_measure_words(line, font_name, font_size, word_w) for line in text.splitlines()]
+    for words, widths in measured:
+        yield from _wrap_line(words, widths, space_w, max_width)
+
 
+def render_pdf(title: str, content: str, output: Union[str, BinaryIO]) -> None:
     page_width, page_height = LETTER
     margin = 54
     title_font = ("Helvetica-Bold", 16)
     body_font = ("Helvetica", 10)
     line_height = 14
 
-    pdf = canvas.Canvas(str(output_path), pagesize=LETTER)
+    pdf = canvas.Canvas(output, pagesize=LETTER)
     y = page_height - margin
 
     pdf.setFont(*title_font)
@@ -138,15 +257,32 @@ def write_pdf(
 
     pdf.setFont(*body_font)
     max_width = page_width - (margin * 2)
+    top_y = page_height - margin
+    draw = pdf.drawString
+    show_page = pdf.showPage
+    set_font = pdf.setFont
     for line in _wrap_text(content, body_font[0], body_font[1], max_width):
         if y <= margin:
-            pdf.showPage()
-            pdf.setFont(*body_font)
-            y = page_height - margin
-        pdf.drawString(margin, y, line)
+            show_page()
+            set_font(*body_font)
+            y = top_y
+        draw(margin, y, line)
         y -= line_height
 
     pdf.save()
+
+
+def write_pdf(
+    title: str,
+    content: str,
+    filename: str,
+    project_key: Optional[str] = None,
+) -> Tuple[str, Path]:
+    safe_name = sanitize_filename(filename)
+    output_path = ensure_output_path(safe_name, project_key)
+    # The output folder path is cached, so recreate it if it was removed since.
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    render_pdf(title, content, str(output_path))
     return safe_name, output_path
 
 
@@ -160,7 +296,7 @@ def run_export_pdf_tool(args: dict) -> dict:
         raise ValueError("Tool arg 'title' is required.")
     if not content:
         raise ValueError("Tool arg 'content' is required.")
-    if len(content.encode("utf-8")) > 2 * 1024 * 1024:
+    if content_too_large(content):
         raise ValueError("Tool arg 'content' exceeds 2MB limit.")
 
     final_filename = filename or build_filename(title)
@@ -0,0 +1,34 @@
+"""
+Per-page PDF line extraction, run in rag's worker processes for large PDFs.
+Kept free of the API's other imports so a fresh worker only has to load pymupdf.
+"""
+
+import pymupdf
+
+# Lines lying wholly in this top or bottom fraction of a page are header/footer candidates.
+PAGE_MARGIN_RATIO = 0.08
+
+
+def page_lines(page: pymupdf.Page) -> list[tuple[str, bool]]:
+    """(text, in_margin) per text line; in_margin means the line's whole bbox sits in the top/bottom band."""
+    height = page.rect.height
+    top = height * PAGE_MARGIN_RATIO
+    bottom = height - top
+    lines: list[tuple[str, bool]] = []
+    # Body text often comes back as one page-tall block, so judge position per line, not per block.
+    for block in page.get_text("dict", flags=pymupdf.TEXTFLAGS_TEXT)["blocks"]:
+        for line in block.get("lines", ()):
+            text = "".join(span["text"] for span in line["spans"]).strip()
+            if text:
+                _, y0, _, y1 = line["bbox"]
+                lines.append((text, y1 <= top or y0 >= bottom))
+    return lines
+
+
+def extract_page_range(path: str, start: int, stop: int) -> list[list[tuple[str, bool]]]:
+    # MuPDF documents are not thread-safe, so each worker process opens its own copy.
+    doc = pymupdf.open(path, filetype="pdf")
+    try:
+        return [page_lines(doc.load_page(idx)) for idx in range(start, stop)]
+    finally:
+        doc.close()
@@ -1,21 +1,29 @@
-from typing import Optional
+import asyncio
+import io
+import logging
+from typing import Optional, Union
 
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 from image_tool import get_images_dir
 from docx_export import build_docx_filename, write_docx
 from pdf_export import (
     build_filename,
-    ensure_output_path,
-    get_doc_output_dir,
+    content_too_large,
+    get_download_path,
+    render_pdf,
+    resolved_doc_output_dir,
+    sanitize_filename,
     validate_download_filename,
     write_pdf,
 )
 from rag import resolve_project_path
 from xlsx_export import get_xlsx_download_path
 
+logger = logging.getLogger(__name__)
+
 pdf_router = APIRouter()
 
 
@@ -24,6 +32,8 @@ class ExportPdfRequest(BaseModel):
     content: str = Field(min_length=1)
     filename: Optional[str] = None
     project_key: Optional[str] = None
+    # False streams the PDF back directly instead of saving it for /downloads/.
+    persist: bool = True
 
 
 class ExportPdfResponse(BaseModel):
@@ -48,12 +58,12 @@ class ExportDocxResponse(BaseModel):
 
 
 @pdf_router.post("/tools/export_pdf", response_model=ExportPdfResponse)
-def export_pdf(body: ExportPdfRequest) -> ExportPdfResponse:
+async def export_pdf(body: ExportPdfRequest) -> Union[ExportPdfResponse, StreamingResponse]:
     content = body.content.strip()
     if not content:
         raise HTTPException(status_code=400, detail="Content must be non-empty.")
 
-    if len(content.encode("utf-8")) > 2 * 1024 * 1024:
+    if content_too_large(content):
         raise HTTPException(status_code=413, detail="Content exceeds 2MB limit.")
 
     title = body.title.strip() or "Document"
@@ -61,11 +71,20 @@ def export_pdf(body: ExportPdfRequest) -> ExportPdfResponse:
         filename = body.filename.strip() if body.filename else build_filename(title)
         if not filename:
             filename = build_filename(title)
-        final_name, output_path = write_pdf(title, content, filename, body.project_key)
+        if not body.persist:
+            safe_name = sanitize_filename(filename)
+            buf = io.BytesIO()
+            await asyncio.to_thread(render_pdf, title, content, buf)
+            return StreamingResponse(
+                iter([buf.getvalue()]),
+                media_type="application/pdf",
+                headers={"Content-Disposition": f'attachment; filename="{safe_name}"'},
+            )
+        final_name, output_path = await asyncio.to_thread(write_pdf, title, content, filename, body.project_key)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:
-        print(f"[export_pdf] failed: {exc}")
+        logger.exception("export_pdf failed")
         raise HTTPException(status_code=500, detail="Failed to write PDF.") from exc
 
     download_url = f"/downloads/{final_name}"
@@ -80,7 +99,7 @@ def export_docx(body: ExportDocxRequest) -> ExportDocxResponse:
     if not content:
         raise HTTPException(status_code=400, detail="Content must be non-empty.")
 
-    if len(content.encode("utf-8")) > 2 * 1024 * 1024:
+    if content_too_large(content):
         raise HTTPException(status_code=413, detail="Content exceeds 2MB limit.")
 
     title = body.title.strip() or "Document"
@@ -92,7 +111,7 @@ def export_docx(body: ExportDocxRequest) -> ExportDocxResponse:
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:
-        print(f"[export_docx] failed: {exc}")
+        logger.exception("export_docx failed")
         raise HTTPException(status_code=500, detail="Failed to write DOCX.") from exc
 
     download_url = f"/downloads/{final_name}"
@@ -110,7 +129,7 @@ def download_pdf(filename: str, project_key: Optional[str] = None) -> FileRespon
             safe_name = output_path.name
         else:
             safe_name = validate_download_filename(filename)
-            output_path = ensure_output_path(safe_name, project_key)
+            output_path = get_download_path(safe_name, project_key)
             media_type = "application/pdf"
             if safe_name.lower().endswith(".docx"):
                 media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
@@ -126,14 +145,14 @@ def download_pdf(filename: str, project_key: Optional[str] = None) -> FileRespon
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:
-        print(f"[download_pdf] failed: {exc}")
+        logger.exception("download_pdf failed")
         raise HTTPException(status_code=500, detail="Failed to read file.") from exc
 
 
 @pdf_router.get("/tools/paths")
 def get_tool_paths(project_key: Optional[str] = None) -> dict:
     project_path = resolve_project_path(project_key) or ""
-    doc_dir = str(get_doc_output_dir(project_key).resolve())
+    doc_dir = str(resolved_doc_output_dir(project_key))
     image_dir = str(get_images_dir(project_key).resolve())
     return {
         "PROJECT_PATH": project_path,
@@ -3,14 +3,18 @@ from datetime import datetime, timezone
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException
+from postgrest.exceptions import APIError
 from pydantic import BaseModel, Field
 
+from pdf_export import clear_output_dir_cache
 from rag import get_supabase_client
 from local_paths import delete_local_project_path, get_local_project_path, set_local_project_path
 
 projects_router = APIRouter()
 
-PROJECT_KEY_PATTERN = re.compile(r"^[a-z0-9_-]+$")
+UNIQUE_VIOLATION = "23505"
+PROJECT_KEY_PATTERN = re.compile(r"[a-z0-9_-]+")
+_PROJECT_KEY_FULLMATCH = PROJECT_KEY_PATTERN.fullmatch
 
 
 class ProjectCreate(BaseModel):
@@ -28,7 +32,7 @@ def validate_project_key(project_key: str) -> str:
     cleaned = project_key.strip()
     if not cleaned:
         raise HTTPException(status_code=400, detail="project_key is required.")
-    if not PROJECT_KEY_PATTERN.match(cleaned):
+    if not _PROJECT_KEY_FULLMATCH(cleaned):
         raise HTTPException(
             status_code=400,
             detail="project_key must be lowercase letters, numbers, dashes, or underscores.",
@@ -66,25 +70,21 @@ def create_project(body: ProjectCreate) -> dict:
 
     try:
         supabase = get_supabase_client()
-        existing = (
-            supabase.table("projects")
-            .select("project_key")
-            .eq("project_key", project_key)
-            .limit(1)
-            .execute()
-        )
-        if existing.data:
-            raise HTTPException(status_code=409, detail="project_key already exists.")
-
         now = datetime.now(timezone.utc).isoformat()
         payload = {
             "project_key": project_key,
             "display_name": display_name,
             "updated_at": now,
         }
-        result = supabase.table("projects").insert(payload).execute()
+        try:
+            result = supabase.table("projects").insert(payload).execute()
+        except APIError as exc:
+            if exc.code == UNIQUE_VIOLATION:
+                raise HTTPException(status_code=409, detail="project_key already exists.") from exc
+            raise
         if project_path:
             set_local_project_path(project_key, project_path)
+        clear_output_dir_cache()
         response = result.data[0] if result.data else payload
         response["project_path"] = project_path
         return response
@@ -118,6 +118,7 @@ def update_project(project_key: str, body: ProjectUpdate) -> dict:
             raise HTTPException(status_code=404, detail="project not found.")
         if project_path:
             set_local_project_path(cleaned_key, project_path)
+            clear_output_dir_cache()
         response = result.data[0]
         response["project_path"] = project_path or get_local_project_path(cleaned_key) or ""
         return response
@@ -132,25 +133,16 @@ def delete_project(project_key: str) -> dict:
     cleaned_key = validate_project_key(project_key)
     try:
         supabase = get_supabase_client()
-        sources = (
-            supabase.table("sources")
-            .select("id")
-            .eq("project_key", cleaned_key)
-            .limit(1)
-            .execute()
-        )
-        if sources.data:
+        result = supabase.rpc(
+            "delete_project_if_no_sources",
+            {"target_project_key": cleaned_key},
+        ).execute()
+        if result.data == "has_sources":
             raise HTTPException(status_code=409, detail="project has sources")
-
-        result = (
-            supabase.table("projects")
-            .delete()
-            .eq("project_key", cleaned_key)
-            .execute()
-        )
-        if not result.data:
+        if result.data != "deleted":
             raise HTTPException(status_code=404, detail="project not found.")
         delete_local_project_path(cleaned_key)
+        clear_output_dir_cache()
         return {"deleted": True, "project_key": cleaned_key}
     except HTTPException:
         raise
@@ -1,25 +1,56 @@
-import io
+import asyncio
+import logging
+import multiprocessing
 import os
 import re
+import shutil
+import tempfile
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Literal, Optional
+from typing import BinaryIO, List, Literal, Optional
 from uuid import UUID
 
-from fastapi import File, Form, HTTPException, UploadFile
-from openai import OpenAI
+from fastapi import BackgroundTasks, File, Form, HTTPException, UploadFile
+from openai import AsyncOpenAI
 from pydantic import BaseModel, Field
-from pypdf import PdfReader
+import psycopg
+import pymupdf
 from docx import Document
 from openpyxl import load_workbook
-from supabase import Client, create_client
+from supabase import AsyncClient, Client, acreate_client, create_client
 
 from local_paths import get_local_project_path, require_local_project_path
+from pdf_pages import extract_page_range, page_lines
+
+logger = logging.getLogger(__name__)
 
 EMBEDDING_MODEL = "text-embedding-3-small"
 MAX_TOP_K = 20
 DEFAULT_TOP_K = 12
 EMBEDDING_BATCH_SIZE = 50
+# Embedding batches in flight at once; keep well under the account's rate-limit tier.
+EMBEDDING_CONCURRENCY = 5
+CHUNK_COPY_COLUMNS = ("source_id", "chunk_index", "content", "embedding", "scope", "project_key")
 VALID_SCOPES = ("generic", "project", "hybrid")
+# Margin lines (see pdf_pages.PAGE_MARGIN_RATIO) repeated on at least this many pages
+# are treated as running headers/footers.
+HEADER_FOOTER_MIN_REPEATS = 3
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+# PDFs above this page count are split across worker processes for text extraction.
+# Serial extraction runs at roughly 2-3 ms a page; below this, dispatch and result pickling eat the gain.
+PARALLEL_PDF_MIN_PAGES = 64
+# Capped so a large upload cannot take every core from the API process.
+PDF_WORKERS = min(os.cpu_count() or 1, 4)
+# The API runs threads (uvicorn, to_thread, the log listener); forking it can copy held locks into workers.
+PDF_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_WS_RE = re.compile(r"\s+")
+_XLSX_TAB_WS_RE = re.compile(r"[ \t]+")
+_XLSX_NL_TAB_RE = re.compile(r"\n[ \t]+")
+_XLSX_TAB_NL_RE = re.compile(r"[ \t]+\n")
+_XLSX_MULTI_NL_RE = re.compile(r"\n{3,}")
 
 
 class RetrieveRequest(BaseModel):
@@ -47,7 +78,29 @@ class RetrieveResponse(BaseModel):
     results: List[RetrieveResult]
 
 
-def retrieve_chunks(
+_QUERY_EMBEDDINGS: "OrderedDict[tuple[str, str], tuple[float, ...]]" = OrderedDict()
+
+
+async def _embed_query(query: str) -> tuple[float, ...]:
+    # lru_cache would memoise the coroutine object rather than its result, so keep a small LRU by hand.
+    key = (EMBEDDING_MODEL, query)
+    cached = _QUERY_EMBEDDINGS.get(key)
+    if cached is not None:
+        _QUERY_EMBEDDINGS.move_to_end(key)
+        return cached
+    embedding_response = await get_openai_client().embeddings.create(
+        model=EMBEDDING_MODEL,
+        input=[query],
+    )
+    embedding = tuple(embedding_response.data[0].embedding)
+    _QUERY_EMBEDDINGS[key] = embedding
+    if len(_QUERY_EMBEDDINGS) > QUERY_EMBEDDING_CACHE_SIZE:
+        _QUERY_EMBEDDINGS.popitem(last=False)
+    return embedding
+
+
+async def retrieve_chunks(
+    supabase: AsyncClient,
     query: str,
     top_k: int,
     source_id: Optional[UUID],
@@ -59,14 +112,8 @@ def retrieve_chunks(
     if not api_key:
         raise RuntimeError("Missing OPENAI_API_KEY.")
 
-    openai_client = OpenAI(api_key=api_key)
-    embedding_response = openai_client.embeddings.create(
-        model=EMBEDDING_MODEL,
-        input=[query],
-    )
-    query_embedding = embedding_response.data[0].embedding
+    query_embedding = list(await _embed_query(query))
 
-    supabase = get_supabase_client()
     rpc_payload = {
         "query_embedding": query_embedding,
         "match_count": top_k,
@@ -75,18 +122,11 @@ def retrieve_chunks(
         "scope_mode": scope,
         "project_key_filter": project_key,
     }
-    result = supabase.rpc("match_chunks", rpc_payload).execute()
+    result = await supabase.rpc("match_chunks", rpc_payload).execute()
     rows = result.data or []
+    # Pydantic's core validator parses the uuid and float columns; match_chunks names the score "distance".
     return [
-        RetrieveResult(
-            source_id=UUID(row["source_id"]),
-            chunk_index=row["chunk_index"],
-            content=row["content"],
-            score=float(row["distance"]),
-            title=row["title"],
-            scope=row.get("scope", "generic"),
-            project_key=row.get("project_key"),
-        )
+        RetrieveResult.model_validate({"scope": "generic", **row, "score": row["distance"]})
         for row in rows
     ]
 
@@ -97,71 +137,123 @@ def chunk_text(text: str, chunk_size: int = 1200, overlap: int = 200) -> List[st
     cleaned = text.replace("\x00", " ").strip()
     if not cleaned:
         return []
-    chunks: list[str] = []
     step = chunk_size - overlap
-    start = 0
-    while start < len(cleaned):
-        end = min(start + chunk_size, len(cleaned))
-        chunk = cleaned[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
-        start += step
-    return chunks
-
-
-def extract_pdf_text(file_bytes: bytes) -> str:
-    reader = PdfReader(io.BytesIO(file_bytes))
-    pages_lines: list[list[str]] = []
-    header_counts: dict[str, int] = {}
-    footer_counts: dict[str, int] = {}
-
-    for page in reader.pages:
-        extracted = page.extract_text() or ""
-        lines = [line.strip() for line in extracted.splitlines() if line.strip()]
+    # Slices clamp at the end of the string, so no min() is needed per window.
+    return [
+        chunk
+        for start in range(0, len(cleaned), step)
+        if (chunk := cleaned[start : start + chunk_size].strip())
+    ]
+
+
+@lru_cache(maxsize=1)
+def _pdf_executor() -> ProcessPoolExecutor:
+    context = multiprocessing.get_context(PDF_START_METHOD)
+    if PDF_START_METHOD == "forkserver":
+        # Load pymupdf once in the fork server so each worker starts with it already imported.
+        context.set_forkserver_preload(["pdf_pages"])
+    return ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=context)
+
+
+def shutdown_pdf_executor() -> None:
+    """Stop the PDF worker processes, if any were started; called from the app lifespan."""
+    if _pdf_executor.cache_info().currsize:
+        _pdf_executor().shutdown(cancel_futures=True)
+        _pdf_executor.cache_clear()
+
+
+def _extract_page_lines(path: str) -> list[list[tuple[str, bool]]]:
+    doc = pymupdf.open(path, filetype="pdf")
+    try:
+        page_count = doc.page_count
+        if page_count <= PARALLEL_PDF_MIN_PAGES or PDF_WORKERS == 1:
+            return [page_lines(page) for page in doc]
+    finally:
+        doc.close()
+    executor = _pdf_executor()
+    step = -(-page_count // PDF_WORKERS)
+    futures = [
+        executor.submit(extract_page_range, path, start, min(start + step, page_count))
+        for start in range(0, page_count, step)
+    ]
+    return [lines for future in futures for lines in future.result()]
+
+
+def extract_pdf_text(path: str) -> str:
+    pages: list[list[tuple[str, bool]]] = []
+    for lines in _extract_page_lines(path):
         if not lines:
             continue
         # Skip very short pages (likely blank or separator pages)
-        if len(" ".join(lines)) < 50:
+        if len(" ".join(text for text, _ in lines)) < 50:
             continue
-        pages_lines.append(lines)
-        header_counts[lines[0]] = header_counts.get(lines[0], 0) + 1
-        footer_counts[lines[-1]] = footer_counts.get(lines[-1], 0) + 1
+        pages.append(lines)
 
-    header_blacklist = {line for line, count in header_counts.items() if count >= 3}
-    footer_blacklist = {line for line, count in footer_counts.items() if count >= 3}
+    # Margin lines count as headers/footers only when the same text recurs across pages.
+    repeated: frozenset[str] = frozenset()
+    if len(pages) >= HEADER_FOOTER_MIN_REPEATS:
+        margin_counts = Counter(
+            text for lines in pages for text in {text for text, in_margin in lines if in_margin}
+        )
+        repeated = frozenset(
+            text for text, count in margin_counts.items() if count >= HEADER_FOOTER_MIN_REPEATS
+        )
 
     cleaned_pages: list[str] = []
-    for lines in pages_lines:
-        filtered: list[str] = []
-        for idx, line in enumerate(lines):
-            if idx == 0 and line in header_blacklist:
-                continue
-            if idx == len(lines) - 1 and line in footer_blacklist:
-                continue
-            if line.isdigit():
-                continue
-            filtered.append(line)
-        if filtered:
-            paragraph = " ".join(filtered)
-            paragraph = re.sub(r"\s+", " ", paragraph).strip()
-            if paragraph:
-                cleaned_pages.append(paragraph)
+    for lines in pages:
+        paragraph = " ".join(
+            text
+            for text, in_margin in lines
+            if not text.isdigit() and not (in_margin and text in repeated)
+        )
+        paragraph = _WS_RE.sub(" ", paragraph).strip()
+        if paragraph:
+            cleaned_pages.append(paragraph)
 
     return "\n\n".join(cleaned_pages).strip()
 
 
-def get_supabase_client() -> Client:
+def _supabase_credentials() -> tuple[str, str]:
     supabase_url = os.getenv("SUPABASE_URL")
     supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
     if not supabase_url or not supabase_key:
         raise RuntimeError("Missing SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY")
-    return create_client(supabase_url, supabase_key)
+    return supabase_url, supabase_key
+
+
+@lru_cache(maxsize=1)
+def get_supabase_client() -> Client:
+    return create_client(*_supabase_credentials())
 
 
-def project_exists(supabase: Client, project_key: str) -> bool:
+@lru_cache(maxsize=1)
+def get_openai_client() -> AsyncOpenAI:
+    # Callers check OPENAI_API_KEY first so a missing key is never cached.
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+_async_supabase: Optional[AsyncClient] = None
+
+
+async def get_async_supabase_client() -> AsyncClient:
+    global _async_supabase
+    if _async_supabase is None:
+        _async_supabase = await acreate_client(*_supabase_credentials())
+    return _async_supabase
+
+
+async def supabase_dep() -> AsyncClient:
+    """FastAPI dependency that hands each request the shared async Supabase client."""
+    try:
+        return await get_async_supabase_client()
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+async def project_exists(supabase: AsyncClient, project_key: str) -> bool:
     if not project_key:
         return False
-    result = (
+    result = await (
         supabase.table("projects")
         .select("project_key")
         .eq("project_key", project_key)
@@ -184,6 +276,19 @@ def get_default_project_key(supabase: Client) -> Optional[str]:
     return None
 
 
+async def get_default_project_key_async(supabase: AsyncClient) -> Optional[str]:
+    result = await (
+        supabase.table("projects")
+        .select("project_key")
+        .order("created_at", desc=False)
+        .limit(1)
+        .execute()
+    )
+    if result.data:
+        return result.data[0].get("project_key")
+    return None
+
+
 def get_default_project_key_value() -> Optional[str]:
     supabase = get_supabase_client()
     return get_default_project_key(supabase)
@@ -204,6 +309,22 @@ def get_project_display_name(supabase: Client, project_key: str) -> Optional[str
     return None
 
 
+async def get_project_display_name_async(supabase: AsyncClient, project_key: str) -> Optional[str]:
+    if not project_key:
+        return None
+    result = await (
+        supabase.table("projects")
+        .select("display_name")
+        .eq("project_key", project_key)
+        .limit(1)
+        .execute()
+    )
+    if result.data:
+        return result.data[0].get("display_name")
+    return None
+
+
+@lru_cache(maxsize=32)
 def resolve_project_path(project_key: Optional[str]) -> Optional[str]:
     cleaned_key = project_key.strip() if project_key else ""
     if cleaned_key:
@@ -221,14 +342,17 @@ def require_project_path(project_key: Optional[str]) -> str:
     return require_local_project_path(project_key)
 
 
-def resolve_scope_and_project_key(scope: str, project_key: Optional[str]) -> tuple[str, Optional[str]]:
+async def resolve_scope_and_project_key(
+    supabase: AsyncClient,
+    scope: str,
+    project_key: Optional[str],
+) -> tuple[str, Optional[str]]:
     cleaned_scope = (scope or "hybrid").strip().lower()
     if cleaned_scope not in VALID_SCOPES:
         raise HTTPException(status_code=400, detail="Invalid scope.")
     cleaned_project_key = project_key.strip() if project_key else ""
     if cleaned_scope in ("project", "hybrid") and not cleaned_project_key:
-        supabase = get_supabase_client()
-        default_key = get_default_project_key(supabase)
+        default_key = await get_default_project_key_async(supabase)
         if default_key:
             return cleaned_scope, default_key
         return "generic", None
@@ -237,47 +361,103 @@ def resolve_scope_and_project_key(scope: str, project_key: Optional[str]) -> tup
     return cleaned_scope, cleaned_project_key
 
 
-def extract_docx_text(file_bytes: bytes) -> str:
-    document = Document(io.BytesIO(file_bytes))
+def extract_docx_text(path: str) -> str:
+    document = Document(path)
     paragraphs = [para.text.strip() for para in document.paragraphs if para.text.strip()]
     return "\n".join(paragraphs).strip()
 
 
-def extract_xlsx_text(file_bytes: bytes) -> str:
-    wb = load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True)
+def extract_xlsx_text(path: str) -> str:
+    wb = load_workbook(path, read_only=True, data_only=True)
     parts = []
     for sheet in wb.worksheets:
         rows = []
         for row in sheet.iter_rows(values_only=True):
-            cells = [str(c).strip() if c is not None else "" for c in (row or [])]
-            if any(cells):
+            if not row or all(c is None for c in row):
+                continue
+            # Padding inside cells is collapsed by the whitespace passes below, so no per-cell strip().
+            cells = ["" if c is None else str(c) for c in row]
+            if any(cell and not cell.isspace() for cell in cells):
                 rows.append("\t".join(cells))
         if rows:
             parts.append("\n".join(rows))
     wb.close()
     text = "\n\n".join(parts).strip()
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n[ \t]+", "\n", text)
-    text = re.sub(r"[ \t]+\n", "\n", text)
-    return re.sub(r"\n{3,}", "\n\n", text).strip()
+    text = _XLSX_TAB_WS_RE.sub(" ", text)
+    text = _XLSX_NL_TAB_RE.sub("\n", text)
+    text = _XLSX_TAB_NL_RE.sub("\n", text)
+    return _XLSX_MULTI_NL_RE.sub("\n\n", text).strip()
 
 
-def extract_text_from_file(filename: str, file_bytes: bytes) -> str:
+def extract_text_from_file(filename: str, path: str) -> str:
+    """Extract text from the file at path; filename's extension picks the parser."""
     lower = filename.lower()
     if lower.endswith(".pdf"):
-        return extract_pdf_text(file_bytes)
+        return extract_pdf_text(path)
     if lower.endswith(".docx"):
-        return extract_docx_text(file_bytes)
+        return extract_docx_text(path)
     if lower.endswith(".xlsx"):
-        return extract_xlsx_text(file_bytes)
+        return extract_xlsx_text(path)
     raise HTTPException(status_code=400, detail="Unsupported file type.")
 
 
+def build_chunk_rows(base: dict, chunks: List[str], embeddings: list[list[float]]) -> list[dict]:
+    # base carries the columns shared by every chunk of a source.
+    return [
+        {**base, "chunk_index": idx, "content": chunk, "embedding": embedding}
+        for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings))
+    ]
+
+
+def _vector_literal(embedding: List[float]) -> str:
+    return "[" + ",".join(map(str, embedding)) + "]"
+
+
+async def insert_chunk_rows(supabase: AsyncClient, chunk_rows: List[dict]) -> None:
+    """
+    Insert chunk rows. With DATABASE_URL set, stream them through COPY on a direct
+    Postgres connection instead of one large PostgREST JSON insert.
+    """
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        await supabase.table("chunks").insert(chunk_rows).execute()
+        return
+    copy_sql = f"COPY chunks ({', '.join(CHUNK_COPY_COLUMNS)}) FROM STDIN"
+    async with await psycopg.AsyncConnection.connect(database_url) as conn:
+        async with conn.cursor() as cur:
+            async with cur.copy(copy_sql) as copy:
+                for row in chunk_rows:
+                    await copy.write_row(
+                        [
+                            _vector_literal(row[col]) if col == "embedding" else row[col]
+                            for col in CHUNK_COPY_COLUMNS
+                        ]
+                    )
+
+
+async def embed_chunks(openai_client: AsyncOpenAI, chunks: List[str]) -> list[list[float]]:
+    semaphore = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+
+    async def embed_batch(start: int) -> list[list[float]]:
+        async with semaphore:
+            embedding_response = await openai_client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=chunks[start : start + EMBEDDING_BATCH_SIZE],
+            )
+        return [item.embedding for item in embedding_response.data]
+
+    # gather keeps results in submission order, so batches stay aligned with chunks.
+    batches = await asyncio.gather(*(embed_batch(i) for i in range(0, len(chunks), EMBEDDING_BATCH_SIZE)))
+    return [embedding for batch in batches for embedding in batch]
+
+
 def _allowed_upload_extensions() -> tuple[str, ...]:
     return (".pdf", ".docx", ".xlsx")
 
 
-def upload_pdf(
+async def upload_pdf(
+    supabase: AsyncClient,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     title: Optional[str] = Form(None),
     agent_ids: Optional[List[str]] = Form(None),
@@ -303,38 +483,16 @@ def upload_pdf(
     ):
         raise HTTPException(status_code=400, detail="Invalid content type.")
 
-    file_bytes = file.file.read()
-    if not file_bytes:
+    upload = file.file
+    upload.seek(0, os.SEEK_END)
+    if not upload.tell():
         raise HTTPException(status_code=400, detail="Empty upload.")
-
-    text = extract_text_from_file(file.filename, file_bytes)
-    if not text.strip():
-        raise HTTPException(status_code=400, detail="No text extracted from file.")
-
-    chunks = chunk_text(text, chunk_size=1200, overlap=200)
-    if not chunks:
-        raise HTTPException(status_code=400, detail="No chunks produced.")
+    upload.seek(0)
 
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise HTTPException(status_code=500, detail="Missing OPENAI_API_KEY.")
 
-    openai_client = OpenAI(api_key=api_key)
-    try:
-        embeddings: list[list[float]] = []
-        for i in range(0, len(chunks), EMBEDDING_BATCH_SIZE):
-            batch = chunks[i : i + EMBEDDING_BATCH_SIZE]
-            embedding_response = openai_client.embeddings.create(
-                model=EMBEDDING_MODEL,
-                input=batch,
-            )
-            embeddings.extend([item.embedding for item in embedding_response.data])
-    except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"Embedding failed: {exc}") from exc
-
-    if len(embeddings) != len(chunks):
-        raise HTTPException(status_code=502, detail="Embedding count mismatch.")
-
     source_title = title.strip() if title and title.strip() else file.filename
     cleaned_agents = [agent.strip() for agent in (agent_ids or []) if agent.strip()]
     source_agents = cleaned_agents if cleaned_agents else None
@@ -348,43 +506,104 @@ def upload_pdf(
     else:
         cleaned_project_key = ""
 
-    try:
-        supabase = get_supabase_client()
-        if cleaned_scope == "project" and not project_exists(supabase, cleaned_project_key):
+    if cleaned_scope == "project":
+        try:
+            known_project = await project_exists(supabase, cleaned_project_key)
+        except Exception as exc:
+            raise HTTPException(status_code=500, detail=f"Supabase lookup failed: {exc}") from exc
+        if not known_project:
             raise HTTPException(status_code=400, detail="Unknown project_key.")
+
+    # Starlette closes the upload once the response is sent, so the background task gets its own copy on disk.
+    upload_path = await asyncio.to_thread(_spool_upload, upload, os.path.splitext(filename_lower)[1])
+    try:
         source_payload = {
             "title": source_title,
             "agent_ids": source_agents,
             "scope": cleaned_scope,
             "project_key": cleaned_project_key or None,
             "source_path": source_path.strip() if source_path and source_path.strip() else None,
+            "status": "pending",
         }
-        source_result = supabase.table("sources").insert(source_payload).execute()
+        source_result = await supabase.table("sources").insert(source_payload).execute()
         if not source_result.data:
             raise RuntimeError("No source row returned.")
         source_id = source_result.data[0]["id"]
-
-        chunk_rows = [
-            {
-                "source_id": source_id,
-                "chunk_index": idx,
-                "content": chunk,
-                "embedding": embeddings[idx],
-                "scope": cleaned_scope,
-                "project_key": cleaned_project_key or None,
-            }
-            for idx, chunk in enumerate(chunks)
-        ]
-        supabase.table("chunks").insert(chunk_rows).execute()
-    except HTTPException:
-        raise
     except Exception as exc:
+        Path(upload_path).unlink(missing_ok=True)
         raise HTTPException(status_code=500, detail=f"Supabase insert failed: {exc}") from exc
 
-    return {"source_id": source_id, "chunks_indexed": len(chunks)}
+    background_tasks.add_task(
+        index_source,
+        supabase,
+        source_id,
+        file.filename,
+        upload_path,
+        {"source_id": source_id, "scope": cleaned_scope, "project_key": cleaned_project_key or None},
+    )
+    return {"source_id": source_id, "status": "pending"}
+
+
+def _spool_upload(upload: BinaryIO, suffix: str) -> str:
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        shutil.copyfileobj(upload, tmp)
+    return tmp.name
+
+
+async def index_source(
+    supabase: AsyncClient,
+    source_id: str,
+    filename: str,
+    upload_path: str,
+    chunk_base: dict,
+) -> None:
+    """
+    Extract, embed and store a pending source's chunks, then record the outcome on its row.
+    upload_path is a spooled copy of the upload and is removed once parsed.
+    """
+    try:
+        try:
+            text = await asyncio.to_thread(extract_text_from_file, filename, upload_path)
+        finally:
+            Path(upload_path).unlink(missing_ok=True)
+        if not text.strip():
+            raise ValueError("No text extracted from file.")
 
+        chunks = chunk_text(text, chunk_size=1200, overlap=200)
+        if not chunks:
+            raise ValueError("No chunks produced.")
 
-def retrieve(body: RetrieveRequest) -> RetrieveResponse:
+        embeddings = await embed_chunks(get_openai_client(), chunks)
+        if len(embeddings) != len(chunks):
+            raise ValueError("Embedding count mismatch.")
+
+        await insert_chunk_rows(supabase, build_chunk_rows(chunk_base, chunks, embeddings))
+    except Exception as exc:
+        logger.exception("Indexing failed for source %s", source_id)
+        update = {"status": "failed", "error": str(exc)}
+    else:
+        update = {"status": "ready", "error": None}
+    await supabase.table("sources").update(update).eq("id", source_id).execute()
+
+
+async def get_source_status(supabase: AsyncClient, source_id: UUID) -> dict:
+    try:
+        result = await (
+            supabase.table("sources")
+            .select("id,status,error")
+            .eq("id", str(source_id))
+            .limit(1)
+            .execute()
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Failed to load source status: {exc}") from exc
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Source not found.")
+    row = result.data[0]
+    return {"source_id": row["id"], "status": row["status"], "error": row.get("error")}
+
+
+async def retrieve(supabase: AsyncClient, body: RetrieveRequest) -> RetrieveResponse:
     query = body.query.strip()
     if not query:
         raise HTTPException(status_code=400, detail="Query must be non-empty.")
@@ -393,11 +612,13 @@ def retrieve(body: RetrieveRequest) -> RetrieveResponse:
         agent_filter = body.agent_ids
         if not agent_filter and body.agent_id:
             agent_filter = [body.agent_id]
-        cleaned_scope, cleaned_project_key = resolve_scope_and_project_key(
+        cleaned_scope, cleaned_project_key = await resolve_scope_and_project_key(
+            supabase,
             body.scope,
             body.project_key,
         )
-        results = retrieve_chunks(
+        results = await retrieve_chunks(
+            supabase,
             query,
             body.top_k,
             body.source_id,
@@ -412,12 +633,11 @@ def retrieve(body: RetrieveRequest) -> RetrieveResponse:
     return RetrieveResponse(query=query, results=results)
 
 
-def list_sources() -> list[dict]:
+async def list_sources(supabase: AsyncClient) -> list[dict]:
     try:
-        supabase = get_supabase_client()
-        result = (
+        result = await (
             supabase.table("sources")
-            .select("id,title,created_at,agent_id,agent_ids,scope,project_key,source_path")
+            .select("id,title,created_at,agent_id,agent_ids,scope,project_key,source_path,status,error")
             .order("created_at", desc=True)
             .execute()
         )
@@ -426,10 +646,9 @@ def list_sources() -> list[dict]:
         raise HTTPException(status_code=500, detail=f"Failed to load sources: {exc}") from exc
 
 
-def delete_source(source_id: UUID) -> dict:
+async def delete_source(supabase: AsyncClient, source_id: UUID) -> dict:
     try:
-        supabase = get_supabase_client()
-        result = supabase.table("sources").delete().eq("id", str(source_id)).execute()
+        result = await supabase.table("sources").delete().eq("id", str(source_id)).execute()
         if not result.data:
             raise HTTPException(status_code=404, detail="Source not found.")
         return {"deleted": True, "source_id": str(source_id)}
@@ -439,10 +658,23 @@ def delete_source(source_id: UUID) -> dict:
         raise HTTPException(status_code=500, detail=f"Failed to delete source: {exc}") from exc
 
 
-def refresh_source(source_id: UUID) -> dict:
+async def _record_refresh_failure(supabase: AsyncClient, source_id: UUID, error: str) -> None:
+    # Best effort: the caller is already reporting the refresh error.
+    try:
+        await (
+            supabase.table("sources")
+            .update({"status": "failed", "error": error})
+            .eq("id", str(source_id))
+            .execute()
+        )
+    except Exception:
+        logger.exception("Could not record refresh failure for source %s", source_id)
+
+
+async def refresh_source(supabase: AsyncClient, source_id: UUID) -> dict:
+    started = False
     try:
-        supabase = get_supabase_client()
-        source_result = (
+        source_result = await (
             supabase.table("sources")
             .select("id,title,scope,project_key,agent_id,agent_ids,source_path")
             .eq("id", str(source_id))
@@ -452,17 +684,23 @@ def refresh_source(source_id: UUID) -> dict:
         if not source_result.data:
             raise HTTPException(status_code=404, detail="Source not found.")
         source = source_result.data[0]
+        await (
+            supabase.table("sources")
+            .update({"status": "pending", "error": None})
+            .eq("id", str(source_id))
+            .execute()
+        )
+        started = True
         source_path = source.get("source_path") or ""
         if not source_path:
             raise HTTPException(status_code=400, detail="source_path is missing for this source.")
         if not os.path.exists(source_path):
             raise HTTPException(status_code=404, detail="source_path does not exist.")
 
-        file_bytes = Path(source_path).read_bytes()
-        if not file_bytes:
+        if not os.path.getsize(source_path):
             raise HTTPException(status_code=400, detail="Source file is empty.")
 
-        text = extract_text_from_file(source_path, file_bytes)
+        text = await asyncio.to_thread(extract_text_from_file, source_path, source_path)
         if not text.strip():
             raise HTTPException(status_code=400, detail="No text extracted from source file.")
 
@@ -474,34 +712,36 @@ def refresh_source(source_id: UUID) -> dict:
         if not api_key:
             raise HTTPException(status_code=500, detail="Missing OPENAI_API_KEY.")
 
-        openai_client = OpenAI(api_key=api_key)
-        embeddings: list[list[float]] = []
-        for i in range(0, len(chunks), EMBEDDING_BATCH_SIZE):
-            batch = chunks[i : i + EMBEDDING_BATCH_SIZE]
-            embedding_response = openai_client.embeddings.create(
-                model=EMBEDDING_MODEL,
-                input=batch,
-            )
-            embeddings.extend([item.embedding for item in embedding_response.data])
+        openai_client = get_openai_client()
+        embeddings = await embed_chunks(openai_client, chunks)
 
         if len(embeddings) != len(chunks):
             raise HTTPException(status_code=502, detail="Embedding count mismatch.")
 
-        supabase.table("chunks").delete().eq("source_id", str(source_id)).execute()
-        chunk_rows = [
+        await supabase.table("chunks").delete().eq("source_id", str(source_id)).execute()
+        chunk_rows = build_chunk_rows(
             {
                 "source_id": str(source_id),
-                "chunk_index": idx,
-                "content": chunk,
-                "embedding": embeddings[idx],
                 "scope": source.get("scope") or "generic",
                 "project_key": source.get("project_key"),
-            }
-            for idx, chunk in enumerate(chunks)
-        ]
-        supabase.table("chunks").insert(chunk_rows).execute()
+            },
+            chunks,
+            embeddings,
+        )
+        await insert_chunk_rows(supabase, chunk_rows)
+        await (
+            supabase.table("sources")
+            .update({"status": "ready", "error": None})
+            .eq("id", str(source_id))
+            .execute()
+        )
         return {"updated": True, "source_id": str(source_id), "chunks_indexed": len(chunks)}
-    except HTTPException:
+    except HTTPException as exc:
+        if started:
+            await _record_refresh_failure(supabase, source_id, str(exc.detail))
         raise
     except Exception as exc:
+        if started:
+            logger.exception("Refresh failed for source %s", source_id)
+            await _record_refresh_failure(supabase, source_id, str(exc))
         raise HTTPException(status_code=500, detail=f"Failed to refresh source: {exc}") from exc
@@ -1,29 +1,36 @@
-from fastapi import APIRouter, File, Form, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, UploadFile
+from supabase import AsyncClient
 from uuid import UUID
 
 from rag import (
     RetrieveRequest,
     RetrieveResponse,
     delete_source,
+    get_source_status,
     list_sources,
     refresh_source,
     retrieve,
+    supabase_dep,
     upload_pdf,
 )
 
 rag_router = APIRouter()
 
 
-@rag_router.post("/rag/upload_pdf")
-def upload_pdf_route(
+@rag_router.post("/rag/upload_pdf", status_code=202)
+async def upload_pdf_route(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     title: str | None = Form(None),
     agent_ids: list[str] | None = Form(None),
     scope: str = Form("generic"),
     project_key: str | None = Form(None),
     source_path: str | None = Form(None),
+    supabase: AsyncClient = Depends(supabase_dep),
 ) -> dict:
-    return upload_pdf(
+    return await upload_pdf(
+        supabase,
+        background_tasks,
         file=file,
         title=title,
         agent_ids=agent_ids,
@@ -34,20 +41,28 @@ def upload_pdf_route(
 
 
 @rag_router.post("/rag/retrieve", response_model=RetrieveResponse)
-def retrieve_route(body: RetrieveRequest) -> RetrieveResponse:
-    return retrieve(body)
+async def retrieve_route(
+    body: RetrieveRequest,
+    supabase: AsyncClient = Depends(supabase_dep),
+) -> RetrieveResponse:
+    return await retrieve(supabase, body)
 
 
 @rag_router.get("/rag/sources")
-def list_sources_route() -> list[dict]:
-    return list_sources()
+async def list_sources_route(supabase: AsyncClient = Depends(supabase_dep)) -> list[dict]:
+    return await list_sources(supabase)
+
+
+@rag_router.get("/rag/sources/{source_id}/status")
+async def source_status_route(source_id: UUID, supabase: AsyncClient = Depends(supabase_dep)) -> dict:
+    return await get_source_status(supabase, source_id)
 
 
 @rag_router.delete("/rag/sources/{source_id}")
-def delete_source_route(source_id: UUID) -> dict:
-    return delete_source(source_id)
+async def delete_source_route(source_id: UUID, supabase: AsyncClient = Depends(supabase_dep)) -> dict:
+    return await delete_source(supabase, source_id)
 
 
 @rag_router.post("/rag/sources/{source_id}/refresh")
-def refresh_source_route(source_id: UUID) -> dict:
-    return refresh_source(source_id)
+async def refresh_source_route(source_id: UUID, supabase: AsyncClient = Depends(supabase_dep)) -> dict:
+    return await refresh_source(supabase, source_id)
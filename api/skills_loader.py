@@ -7,17 +7,41 @@ Ref: https://agentskills.io/integrate-skills
 Ref: https://developers.openai.com/codex/skills/
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
 from pathlib import Path
 import re
+import tempfile
 
 SKILLS_DIR = Path(__file__).resolve().parent / "skills"
 SKILL_FILENAME = "SKILL.md"
 OPENAI_YAML = "agents/openai.yaml"
+# Cold discovery reads skill files on a thread pool once there are more than this many skills.
+PARALLEL_READ_MIN_SKILLS = 4
+SKILL_READ_WORKERS = 8
+# Discovery only needs the frontmatter at the top of SKILL.md; descriptions are already ~1 KB.
+SKILL_HEAD_BYTES = 16 * 1024
+# Discovery results persisted across restarts; reused while its manifest still matches.
+SNAPSHOT_FILENAME = ".skills_snapshot.json"
+# Bump when discovery output changes shape or meaning; older snapshots are then ignored.
+SNAPSHOT_VERSION = 1
+_FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---", re.DOTALL)
+_OPENAI_YAML_RE = re.compile(r"^[ \t]*(display_name|short_description):(.*)$", re.MULTILINE)
+_XML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&apos;"})
+
+# Discovered skills, their rendered XML and a lowercased name -> skill folder index,
+# valid while the manifest of skill file stamps is unchanged.
+_SKILLS_CACHE: dict = {"manifest": None, "skills": None, "xml": None, "index": None}
 
 
 def _parse_frontmatter(content: str) -> dict[str, str]:
     """Extract YAML-like frontmatter between first --- and second ---."""
-    match = re.match(r"^---\s*\n(.*?)\n---", content, re.DOTALL)
+    # Cheap rejects: no opening fence, or no closing fence anywhere. Otherwise the lazy
+    # pattern stops at the first closing fence and never walks the body.
+    if not content.startswith("---") or content.find("\n---", 4) == -1:
+        return {}
+    match = _FRONTMATTER_RE.match(content)
     if not match:
         return {}
     block = match.group(1)
@@ -37,53 +61,179 @@ def _parse_frontmatter(content: str) -> dict[str, str]:
     return result
 
 
-def _parse_openai_yaml(skill_dir: Path) -> dict[str, str]:
+def _read_text(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def _read_head(path: str, size: int = SKILL_HEAD_BYTES) -> str:
+    with open(path, "rb") as f:
+        return f.read(size).decode("utf-8", errors="replace")
+
+
+def _parse_openai_yaml(raw: str) -> dict[str, str]:
     """
     Optional agents/openai.yaml (OpenAI/Codex convention): read display_name and short_description.
     See https://developers.openai.com/codex/skills/ — interface.display_name, interface.short_description.
     """
-    path = skill_dir / OPENAI_YAML
-    if not path.is_file():
-        return {}
-    try:
-        raw = path.read_text(encoding="utf-8")
-    except Exception:
-        return {}
     out: dict[str, str] = {}
-    for line in raw.split("\n"):
-        s = line.strip()
-        if s.startswith("display_name:"):
-            val = s[len("display_name:"):].strip().strip('"\'')
-            if val:
-                out["display_name"] = val
-        elif s.startswith("short_description:"):
-            val = s[len("short_description:"):].strip().strip('"\'')
-            if val:
-                out["short_description"] = val
+    for match in _OPENAI_YAML_RE.finditer(raw):
+        key = match.group(1)
+        if key in out:
+            continue
+        val = match.group(2).strip().strip('"\'')
+        if val:
+            out[key] = val
+            if len(out) == 2:
+                break
     return out
 
 
+def _file_stamp(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _build_manifest() -> tuple:
+    """
+    (folder, SKILL.md stamp, openai.yaml stamp) for every subfolder of SKILLS_DIR, where a stamp
+    is (mtime_ns, size) or None. Cheap enough to run on every request; any edit changes it.
+    """
+    try:
+        it = os.scandir(SKILLS_DIR)
+    except OSError:
+        return ()
+    manifest = []
+    with it:
+        for entry in it:
+            if not entry.is_dir():
+                continue
+            skill_stamp = None
+            try:
+                with os.scandir(entry.path) as children:
+                    for child in children:
+                        if child.name == SKILL_FILENAME and child.is_file():
+                            st = child.stat()
+                            skill_stamp = (st.st_mtime_ns, st.st_size)
+                            break
+            except OSError:
+                pass
+            yaml_stamp = _file_stamp(os.path.join(entry.path, OPENAI_YAML)) if skill_stamp else None
+            manifest.append((entry.name, skill_stamp, yaml_stamp))
+    return tuple(manifest)
+
+
+def _manifest_to_json(manifest: tuple) -> list:
+    return [[name, list(md) if md else None, list(yml) if yml else None] for name, md, yml in manifest]
+
+
+def _snapshot_params() -> dict:
+    """Parser settings a snapshot was built with; any change invalidates it."""
+    return {"version": SNAPSHOT_VERSION, "head_bytes": SKILL_HEAD_BYTES}
+
+
+def _load_snapshot(manifest: tuple) -> dict | None:
+    """Discovery results from the on-disk snapshot, or None if it is missing, unreadable or stale."""
+    try:
+        with open(SKILLS_DIR / SNAPSHOT_FILENAME, encoding="utf-8") as f:
+            data = json.load(f)
+        if data["params"] != _snapshot_params() or data["manifest"] != _manifest_to_json(manifest):
+            return None
+        return {"skills": data["skills"], "xml": data["xml"], "index": data["index"]}
+    except Exception:
+        return None
+
+
+def _write_snapshot(manifest: tuple, results: dict) -> None:
+    # Write to a temp file and rename so a concurrent reader never sees a partial snapshot.
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=SKILLS_DIR, prefix=SNAPSHOT_FILENAME, suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"params": _snapshot_params(), "manifest": _manifest_to_json(manifest), **results}, f)
+        os.replace(tmp_path, SKILLS_DIR / SNAPSHOT_FILENAME)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def _cached_skills() -> dict:
+    manifest = _build_manifest()
+    if _SKILLS_CACHE["skills"] is None or _SKILLS_CACHE["manifest"] != manifest:
+        results = _load_snapshot(manifest)
+        if results is None:
+            skills, index = _discover_skills()
+            results = {"skills": skills, "xml": _render_skills_xml(skills), "index": index}
+            _write_snapshot(manifest, results)
+        _SKILLS_CACHE.update(manifest=manifest, **results)
+    return _SKILLS_CACHE
+
+
 def discover_skills() -> list[dict]:
     """
     Discover skills: each subfolder of SKILLS_DIR that contains SKILL.md.
     Uses agents/openai.yaml display_name and short_description when present (OpenAI/Codex convention).
     Returns list of {"name": str, "description": str, "path": str} (path = folder name).
+    Results are cached until a SKILL.md or openai.yaml is added, removed or modified.
     """
-    if not SKILLS_DIR.is_dir():
+    return list(_cached_skills()["skills"])
+
+
+def _has_skill_md(path: str) -> bool:
+    try:
+        with os.scandir(path) as children:
+            return any(child.name == SKILL_FILENAME and child.is_file() for child in children)
+    except OSError:
+        return False
+
+
+def _skill_dirs() -> list[os.DirEntry]:
+    """Subfolders of SKILLS_DIR containing SKILL.md, found from directory listings (no per-path stat)."""
+    try:
+        it = os.scandir(SKILLS_DIR)
+    except OSError:
         return []
+    with it:
+        return [entry for entry in it if entry.is_dir() and _has_skill_md(entry.path)]
+
+
+def _read_skill_files(skill_dir: str) -> tuple[str | None, str | None]:
+    """SKILL.md head and agents/openai.yaml text; None for whichever could not be read."""
+    try:
+        raw = _read_head(os.path.join(skill_dir, SKILL_FILENAME))
+    except Exception:
+        return None, None
+    try:
+        raw_yaml = _read_text(os.path.join(skill_dir, OPENAI_YAML))
+    except Exception:
+        raw_yaml = None
+    return raw, raw_yaml
+
+
+def _discover_skills() -> tuple[list[dict], dict[str, str]]:
+    dirs = _skill_dirs()
+    paths = [entry.path for entry in dirs]
+    if len(dirs) > PARALLEL_READ_MIN_SKILLS:
+        # File reads release the GIL; parsing below stays on this thread.
+        with ThreadPoolExecutor(max_workers=min(SKILL_READ_WORKERS, len(dirs))) as pool:
+            contents = list(pool.map(_read_skill_files, paths))
+    else:
+        contents = [_read_skill_files(path) for path in paths]
     out: list[dict] = []
-    for entry in SKILLS_DIR.iterdir():
-        if not entry.is_dir():
-            continue
-        skill_md = entry / SKILL_FILENAME
-        if not skill_md.is_file():
-            continue
-        try:
-            raw = skill_md.read_text(encoding="utf-8")
-        except Exception:
+    # Folder and frontmatter names both resolve; the first folder in listing order wins a clash.
+    index: dict[str, str] = {}
+    for entry, (raw, raw_yaml) in zip(dirs, contents):
+        if raw is None:
             continue
         fm = _parse_frontmatter(raw)
-        oy = _parse_openai_yaml(entry)
+        oy = _parse_openai_yaml(raw_yaml) if raw_yaml else {}
         # name = canonical id for load_skill (frontmatter or folder); description = for matching/display
         name = (fm.get("name") or entry.name).strip() or entry.name
         description = (oy.get("short_description") or fm.get("description") or "").strip()
@@ -92,7 +242,11 @@ def discover_skills() -> list[dict]:
             "description": description,
             "path": entry.name,
         })
-    return out
+        index.setdefault(entry.name.lower(), entry.name)
+        fm_name = (fm.get("name") or "").strip().lower()
+        if fm_name:
+            index.setdefault(fm_name, entry.name)
+    return out, index
 
 
 def get_skill_content(skill_name: str) -> str | None:
@@ -100,28 +254,13 @@ def get_skill_content(skill_name: str) -> str | None:
     Load full SKILL.md content for a skill by name (folder name or frontmatter name).
     Returns None if not found.
     """
-    if not SKILLS_DIR.is_dir():
+    folder = _cached_skills()["index"].get(skill_name.strip().lower())
+    if folder is None:
+        return None
+    try:
+        return _read_text(os.path.join(SKILLS_DIR, folder, SKILL_FILENAME))
+    except Exception:
         return None
-    skill_name = skill_name.strip().lower()
-    for entry in SKILLS_DIR.iterdir():
-        if not entry.is_dir():
-            continue
-        skill_md = entry / SKILL_FILENAME
-        if not skill_md.is_file():
-            continue
-        if entry.name.lower() == skill_name:
-            try:
-                return skill_md.read_text(encoding="utf-8")
-            except Exception:
-                return None
-        try:
-            raw = skill_md.read_text(encoding="utf-8")
-            fm = _parse_frontmatter(raw)
-            if (fm.get("name") or "").strip().lower() == skill_name:
-                return raw
-        except Exception:
-            continue
-    return None
 
 
 def build_available_skills_xml() -> str:
@@ -129,7 +268,10 @@ def build_available_skills_xml() -> str:
     Build <available_skills> XML block for the system prompt (progressive disclosure).
     Descriptions define when to trigger; keep them concise (~50–100 tokens per skill).
     """
-    skills = discover_skills()
+    return _cached_skills()["xml"]
+
+
+def _render_skills_xml(skills: list[dict]) -> str:
     if not skills:
         return ""
     parts = []
@@ -141,10 +283,4 @@ def build_available_skills_xml() -> str:
 
 
 def _escape_xml(s: str) -> str:
-    return (
-        s.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
-        .replace("'", "&apos;")
-    )
+    return s.translate(_XML_ESCAPE)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The API modules are imported as top-level modules, as uvicorn runs them from api/.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
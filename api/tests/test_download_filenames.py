@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from pdf_export import MAX_FILENAME_LEN, validate_download_filename
+
+
+def _reference_validate(filename: str) -> str:
+    # The check-by-check validation validate_download_filename's single regex must agree with.
+    cleaned = filename.strip()
+    if not cleaned:
+        raise ValueError("Filename is required.")
+    if "/" in cleaned or "\\" in cleaned or ":" in cleaned:
+        raise ValueError("Invalid filename.")
+    if ".." in cleaned:
+        raise ValueError("Invalid filename.")
+    if not cleaned.lower().endswith((".pdf", ".docx")):
+        raise ValueError("Only .pdf or .docx files are allowed.")
+    if any(ch not in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._-" for ch in cleaned):
+        raise ValueError("Filename contains invalid characters.")
+    if len(cleaned) > MAX_FILENAME_LEN:
+        raise ValueError("Filename is too long.")
+    return cleaned
+
+
+def _outcome(func, filename: str) -> str:
+    try:
+        return "ok:" + func(filename)
+    except ValueError as exc:
+        return "error:" + str(exc)
+
+
+@pytest.mark.parametrize(
+    "filename",
+    ["report.pdf", "Report_2024-01-01_120000.PDF", "notes.v2.docx", "  padded.pdf  ", "a" * 116 + ".pdf"],
+)
+def test_valid_download_names(filename):
+    assert validate_download_filename(filename) == filename.strip()
+
+
+@pytest.mark.parametrize(
+    ("filename", "message"),
+    [
+        ("", "Filename is required."),
+        ("   ", "Filename is required."),
+        ("../secret.pdf", "Invalid filename."),
+        ("dir/report.pdf", "Invalid filename."),
+        ("dir\\report.pdf", "Invalid filename."),
+        ("C:report.pdf", "Invalid filename."),
+        ("report..pdf", "Invalid filename."),
+        ("..pdf", "Invalid filename."),
+        ("report.txt", "Only .pdf or .docx files are allowed."),
+        ("report.pdf.exe", "Only .pdf or .docx files are allowed."),
+        ("report.xlsx", "Only .pdf or .docx files are allowed."),
+        ("my report.pdf", "Filename contains invalid characters."),
+        ("rapport_é.pdf", "Filename contains invalid characters."),
+        ("report\n.pdf", "Filename contains invalid characters."),
+        ("a" * 117 + ".pdf", "Filename is too long."),
+    ],
+)
+def test_invalid_download_names(filename, message):
+    with pytest.raises(ValueError) as exc_info:
+        validate_download_filename(filename)
+    assert str(exc_info.value) == message
+
+
+def test_download_names_match_reference_checks():
+    rng = random.Random(0)
+    alphabet = "aZ09._- /\\:é\n"
+    suffixes = ("", ".pdf", ".PDF", ".docx", ".txt", ".", "..pdf")
+    for _ in range(5000):
+        length = rng.choice((0, 1, 3, 8, MAX_FILENAME_LEN - 5, MAX_FILENAME_LEN))
+        name = "".join(rng.choice(alphabet) for _ in range(length)) + rng.choice(suffixes)
+        assert _outcome(validate_download_filename, name) == _outcome(_reference_validate, name), repr(name)
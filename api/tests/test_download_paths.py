@@ -0,0 +1,48 @@
+import shutil
+
+import pytest
+
+from docx_export import write_docx
+from pdf_export import clear_output_dir_cache, ensure_output_path, get_download_path, write_pdf
+
+
+@pytest.fixture
+def doc_dir(tmp_path, monkeypatch):
+    output_dir = tmp_path / "Documents"
+    output_dir.mkdir()
+    monkeypatch.setenv("DOC_OUTPUT_DIR", str(output_dir))
+    clear_output_dir_cache()
+    yield output_dir
+    clear_output_dir_cache()
+
+
+def test_download_path_inside_output_dir(doc_dir):
+    (doc_dir / "report.pdf").write_bytes(b"%PDF-1.4")
+    assert get_download_path("report.pdf") == (doc_dir / "report.pdf").resolve()
+
+
+def test_download_rejects_symlink_outside_output_dir(doc_dir, tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "secret.pdf").write_bytes(b"%PDF-1.4")
+    (doc_dir / "leak.pdf").symlink_to(outside / "secret.pdf")
+
+    with pytest.raises(ValueError, match="Invalid filename path."):
+        get_download_path("leak.pdf")
+
+
+def test_write_path_stays_in_output_dir(doc_dir):
+    assert ensure_output_path("report.pdf") == doc_dir.resolve() / "report.pdf"
+    with pytest.raises(ValueError, match="Invalid filename path."):
+        ensure_output_path("../report.pdf")
+
+
+def test_exports_recreate_removed_output_dir(doc_dir):
+    write_pdf("First", "Body", "first.pdf")
+    shutil.rmtree(doc_dir)
+
+    write_pdf("Second", "Body", "second.pdf")
+    write_docx("Third", "Body", "third.docx")
+
+    assert (doc_dir / "second.pdf").is_file()
+    assert (doc_dir / "third.docx").is_file()
@@ -0,0 +1,21 @@
+from fastapi.testclient import TestClient
+
+import main
+from pdf_export import clear_output_dir_cache, render_pdf
+
+
+def test_downloads_are_not_gzipped(tmp_path, monkeypatch):
+    monkeypatch.setenv("DOC_OUTPUT_DIR", str(tmp_path))
+    clear_output_dir_cache()
+    render_pdf("Title", "hello " * 5000, str(tmp_path / "report.pdf"))
+    client = TestClient(main.app)
+    try:
+        download = client.get("/downloads/report.pdf", headers={"Accept-Encoding": "gzip"})
+        schema = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    finally:
+        clear_output_dir_cache()
+
+    assert download.status_code == 200
+    assert "content-encoding" not in download.headers
+    assert download.headers["content-length"] == str((tmp_path / "report.pdf").stat().st_size)
+    assert schema.headers["content-encoding"] == "gzip"
@@ -0,0 +1,55 @@
+import io
+
+import pymupdf
+
+from pdf_export import render_pdf
+import rag
+from rag import extract_pdf_text
+
+
+def test_exported_pdf_survives_extraction(tmp_path):
+    paragraphs = [f"Paragraph {i}: " + "lorem ipsum dolor sit amet consectetur " * 8 for i in range(40)]
+    buffer = io.BytesIO()
+    render_pdf("Extraction check", "\n\n".join(paragraphs), buffer)
+
+    pdf_path = tmp_path / "export.pdf"
+    pdf_path.write_bytes(buffer.getvalue())
+
+    text = extract_pdf_text(str(pdf_path))
+
+    for i in range(40):
+        assert f"Paragraph {i}:" in text
+
+
+def test_repeated_margin_lines_are_dropped(tmp_path):
+    doc = pymupdf.open()
+    for i in range(4):
+        page = doc.new_page()
+        page.insert_text((72, 30), "RUNNING HEADER TEXT")
+        page.insert_text((72, 300), f"Body paragraph {i} with enough words to count as a real page.")
+        page.insert_text((300, 780), str(i + 1))
+
+    pdf_path = tmp_path / "headers.pdf"
+    doc.save(str(pdf_path))
+
+    text = extract_pdf_text(str(pdf_path))
+
+    assert "RUNNING HEADER TEXT" not in text
+    assert "Body paragraph 3 with enough words" in text
+
+
+def test_pooled_extraction_matches_serial(tmp_path, monkeypatch):
+    paragraphs = [f"Paragraph {i}: " + "lorem ipsum dolor sit amet consectetur " * 8 for i in range(120)]
+    pdf_path = tmp_path / "export.pdf"
+    render_pdf("Pool check", "\n\n".join(paragraphs), str(pdf_path))
+    serial = extract_pdf_text(str(pdf_path))
+
+    monkeypatch.setattr(rag, "PDF_WORKERS", 2)
+    monkeypatch.setattr(rag, "PARALLEL_PDF_MIN_PAGES", 0)
+    try:
+        pooled = extract_pdf_text(str(pdf_path))
+        assert rag._pdf_executor.cache_info().currsize == 1
+    finally:
+        rag.shutdown_pdf_executor()
+
+    assert pooled == serial
@@ -0,0 +1,61 @@
+import shutil
+
+import pytest
+
+import pdf_export
+from xlsx_export import (
+    MAX_FILENAME_LEN,
+    ensure_xlsx_output_path,
+    get_xlsx_download_path,
+    sanitize_xlsx_filename,
+    write_xlsx,
+)
+
+
+@pytest.fixture
+def project_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_export, "require_project_path", lambda project_key: str(tmp_path))
+    pdf_export.clear_output_dir_cache()
+    yield tmp_path
+    pdf_export.clear_output_dir_cache()
+
+
+def test_write_xlsx_recreates_removed_gen_dir(project_dir):
+    sheets = [{"name": "Data", "rows": [["a", 1]]}]
+    write_xlsx("First", sheets, "first.xlsx", "demo")
+    shutil.rmtree(project_dir / "gen")
+
+    write_xlsx("Second", sheets, "second.xlsx", "demo")
+
+    assert (project_dir / "gen" / "second.xlsx").is_file()
+
+
+@pytest.mark.parametrize(
+    "filename",
+    ["../escape.xlsx", "..\\escape.xlsx", "dir/nested.xlsx", "C:evil.xlsx", "..", "report.txt", "a" * 200],
+)
+def test_sanitized_names_stay_in_gen_dir(project_dir, filename):
+    safe = sanitize_xlsx_filename(filename)
+    path = ensure_xlsx_output_path(safe, "demo")
+
+    assert path.parent == (project_dir / "gen").resolve()
+    assert path.name.endswith(".xlsx")
+    assert len(path.name) <= MAX_FILENAME_LEN
+
+
+@pytest.mark.parametrize("filename", ["", ".", "..", "../escape.xlsx", "dir\\escape.xlsx"])
+def test_unsanitized_output_names_are_rejected(project_dir, filename):
+    with pytest.raises(ValueError, match="Invalid filename path."):
+        ensure_xlsx_output_path(filename, "demo")
+
+
+def test_xlsx_download_rejects_symlink_outside_gen_dir(project_dir, tmp_path):
+    gen_dir = project_dir / "gen"
+    gen_dir.mkdir(exist_ok=True)
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "secret.xlsx").write_bytes(b"PK")
+    (gen_dir / "leak.xlsx").symlink_to(outside / "secret.xlsx")
+
+    with pytest.raises(ValueError, match="Invalid filename path."):
+        get_xlsx_download_path("leak.xlsx", "demo")
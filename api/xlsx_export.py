@@ -4,20 +4,26 @@ Uses openpyxl to build .xlsx from structured sheet data (title, sheets with rows
 """
 
 import re
-from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, List, Optional, Tuple
 
 from openpyxl import Workbook
 
-from pdf_export import get_gen_output_dir
+from pdf_export import resolved_gen_output_dir, utc_timestamp
 
 MAX_FILENAME_LEN = 120
 ALLOWED_FILENAME_RE = re.compile(r"[^a-zA-Z0-9\-_. ]+")
+# Underscore is left out of the allowed set so runs of "_" and disallowed chars collapse to one "_".
+_FILENAME_BASE_RE = re.compile(r"[^a-zA-Z0-9\-. ]+")
+_SLASH_TRANS = str.maketrans({"\\": "_", "/": "_"})
+_PASSTHROUGH_TYPES = frozenset((int, float, type(None)))
 
 
+@lru_cache(maxsize=256)
 def sanitize_xlsx_filename(value: str) -> str:
-    cleaned = value.replace("\\", "_").replace("/", "_").strip()
+    cleaned = value.translate(_SLASH_TRANS).strip()
+    # "." is an allowed character, so traversal runs must be broken up explicitly.
     cleaned = cleaned.replace("..", "_")
     cleaned = ALLOWED_FILENAME_RE.sub("_", cleaned)
     cleaned = cleaned.strip(" .")
@@ -34,21 +40,18 @@ def sanitize_xlsx_filename(value: str) -> str:
 def build_xlsx_filename(title: str) -> str:
     base = title.strip() or "workbook"
     base = base.lower().replace(" ", "_")
-    base = ALLOWED_FILENAME_RE.sub("_", base)
-    base = re.sub(r"_+", "_", base).strip("_")
+    base = _FILENAME_BASE_RE.sub("_", base).strip("_")
     if not base:
         base = "workbook"
-    timestamp = datetime.utcnow().strftime("%Y-%m-%d_%H%M%S")
-    return sanitize_xlsx_filename(f"{base}_{timestamp}.xlsx")
+    return sanitize_xlsx_filename(f"{base}_{utc_timestamp()}.xlsx")
 
 
 def ensure_xlsx_output_path(filename: str, project_key: Optional[str] = None) -> Path:
-    output_dir = get_gen_output_dir(project_key).resolve()
-    safe = sanitize_xlsx_filename(filename)
-    candidate = (output_dir / safe).resolve()
-    if output_dir not in candidate.parents and candidate != output_dir:
+    """Resolve an already-sanitized filename inside the gen folder (see sanitize_xlsx_filename)."""
+    # Sanitized names are a single plain component, so no resolve() walk is needed to contain them.
+    if filename in ("", ".", "..") or "/" in filename or "\\" in filename:
         raise ValueError("Invalid filename path.")
-    return candidate
+    return resolved_gen_output_dir(project_key) / filename
 
 
 def get_xlsx_download_path(filename: str, project_key: Optional[str] = None) -> Path:
@@ -56,7 +59,7 @@ def get_xlsx_download_path(filename: str, project_key: Optional[str] = None) ->
     safe = sanitize_xlsx_filename(filename.strip())
     if not safe.lower().endswith(".xlsx"):
         raise ValueError("Filename must be .xlsx")
-    output_dir = get_gen_output_dir(project_key).resolve()
+    output_dir = resolved_gen_output_dir(project_key)
     candidate = (output_dir / safe).resolve()
     if output_dir not in candidate.parents and candidate != output_dir:
         raise ValueError("Invalid filename path.")
@@ -71,6 +74,13 @@ def _cell_value(v: Any) -> str | int | float | None:
     return str(v).strip()
 
 
+def _coerce_row(row: list | tuple) -> list | tuple:
+    # All-numeric rows (the common case for data sheets) need no per-cell conversion.
+    if all(type(c) in _PASSTHROUGH_TYPES for c in row):
+        return row
+    return [_cell_value(c) for c in row]
+
+
 def write_xlsx(
     title: str,
     sheets: List[dict],
@@ -85,20 +95,20 @@ def write_xlsx(
         raise ValueError("At least one sheet is required.")
     safe_name = sanitize_xlsx_filename(filename)
     output_path = ensure_xlsx_output_path(safe_name, project_key)
+    # The gen folder path is cached, so recreate it if it was removed since.
+    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    wb = Workbook()
+    # Write-only workbooks stream each appended row out instead of keeping Cell objects around;
+    # they start with no sheets, so every sheet comes from create_sheet.
+    wb = Workbook(write_only=True)
     for idx, sh in enumerate(sheets):
         sheet_name = str(sh.get("name") or f"Sheet{idx + 1}")[:31]
         rows = sh.get("rows") or []
-        if idx == 0:
-            ws = wb.active
-            ws.title = sheet_name
-        else:
-            ws = wb.create_sheet(title=sheet_name)
+        ws = wb.create_sheet(title=sheet_name)
         for row in rows:
             if not isinstance(row, (list, tuple)):
                 continue
-            ws.append([_cell_value(c) for c in row])
+            ws.append(_coerce_row(row))
     wb.save(str(output_path))
     return safe_name, output_path
 
@@ -12,6 +12,14 @@ type SourceItem = {
   scope?: "generic" | "project";
   project_key?: string | null;
   source_path?: string | null;
+  status?: "pending" | "ready" | "failed";
+  error?: string | null;
+};
+
+type SourceStatusResponse = {
+  source_id: string;
+  status: "pending" | "ready" | "failed";
+  error?: string | null;
 };
 
 type ProjectItem = {
@@ -36,6 +44,8 @@ type ToolPathsResponse = {
 };
 
 const API_BASE = "http://localhost:8000";
+const SOURCE_STATUS_POLL_MS = 2000;
+const SOURCE_STATUS_POLL_LIMIT = 150;
 const AGENTS = [
   { id: "creative_director", name: "Creative Director" },
   { id: "art_director", name: "Art Director" },
@@ -72,6 +82,7 @@ export default function AdminPage() {
   const projectPathPickerRef = useRef<HTMLInputElement>(null);
   const editPathPickerRef = useRef<HTMLInputElement>(null);
   const fileRef = useRef<HTMLInputElement>(null);
+  const isMountedRef = useRef(true);
   const [isTesting, setIsTesting] = useState(false);
   const [testStatus, setTestStatus] = useState<{
     state: "idle" | "success" | "error";
@@ -174,6 +185,10 @@ export default function AdminPage() {
     void loadSources();
     void loadProjects();
     void loadImageDefaults();
+    isMountedRef.current = true;
+    return () => {
+      isMountedRef.current = false;
+    };
   }, []);
 
   useEffect(() => {
@@ -204,6 +219,48 @@ export default function AdminPage() {
     }
   }, [scope, activeProjectKey, projects]);
 
+  const pollSourceStatus = async (sourceId: string) => {
+    for (let attempt = 0; attempt < SOURCE_STATUS_POLL_LIMIT; attempt += 1) {
+      await new Promise((resolve) => setTimeout(resolve, SOURCE_STATUS_POLL_MS));
+      if (!isMountedRef.current) return;
+      try {
+        const response = await fetch(`${API_BASE}/rag/sources/${sourceId}/status`);
+        if (!response.ok) {
+          throw new Error(`Status check failed: ${response.status}`);
+        }
+        const data = (await response.json()) as SourceStatusResponse;
+        if (data.status === "pending") continue;
+        await loadSources();
+        setStatus(
+          data.status === "ready"
+            ? "Upload indexed."
+            : `Error: Indexing failed${data.error ? `: ${data.error}` : "."}`,
+        );
+        return;
+      } catch (err) {
+        const message = err instanceof Error ? err.message : "Unknown error";
+        setStatus(`Error: ${message}`);
+        return;
+      }
+    }
+    setStatus("Indexing is still running. Reload sources to check again.");
+  };
+
+  const renderStatusBadge = (item: SourceItem) => {
+    if (item.status === "pending") {
+      return <span className="status-badge pending">Indexing</span>;
+    }
+    if (item.status === "failed") {
+      return <span className="status-badge failed">Failed</span>;
+    }
+    return null;
+  };
+
+  const renderStatusError = (item: SourceItem) =>
+    item.status === "failed" && item.error ? (
+      <div className="admin-row-error">{item.error}</div>
+    ) : null;
+
   const handleUpload = async () => {
     const file = fileRef.current?.files?.[0];
     if (!file) {
@@ -246,8 +303,8 @@ export default function AdminPage() {
         const text = await response.text();
         throw new Error(text || `Upload failed: ${response.status}`);
       }
+      const uploaded = (await response.json()) as { source_id: string };
 
-      setStatus("Upload successful.");
       setTitle("");
       setSourcePath("");
       setScope("generic");
@@ -256,6 +313,8 @@ export default function AdminPage() {
         fileRef.current.value = "";
       }
       await loadSources();
+      setStatus("Upload received. Indexing...");
+      void pollSourceStatus(uploaded.source_id);
     } catch (err) {
       const message = err instanceof Error ? err.message : "Unknown error";
       setStatus(`Error: ${message}`);
@@ -267,6 +326,9 @@ export default function AdminPage() {
   const handleRefresh = async (item: SourceItem) => {
     if (!item.source_path) return;
     setStatus("Updating source...");
+    setSources((prev) =>
+      prev.map((source) => (source.id === item.id ? { ...source, status: "pending", error: null } : source)),
+    );
     try {
       const response = await fetch(`${API_BASE}/rag/sources/${item.id}/refresh`, {
         method: "POST",
@@ -283,10 +345,11 @@ export default function AdminPage() {
         }
         throw new Error(msg);
       }
-      setStatus("Source updated.");
       await loadSources();
+      setStatus("Source updated.");
     } catch (err) {
       const message = err instanceof Error ? err.message : "Unknown error";
+      await loadSources();
       setStatus(`Error: ${message}`);
     }
   };
@@ -925,6 +988,7 @@ export default function AdminPage() {
                               <div className="admin-row-title">
                                 {item.title}
                                 <span className="scope-badge generic">Generic</span>
+                                {renderStatusBadge(item)}
                               </div>
                               <div className="admin-row-meta">
                                 {new Date(item.created_at).toLocaleString()} ·{" "}
@@ -944,6 +1008,7 @@ export default function AdminPage() {
                                   <span className="admin-path-missing">Path not set</span>
                                 )}
                               </div>
+                              {renderStatusError(item)}
                             </div>
                             <div className="admin-row-actions">
                               <button
@@ -978,6 +1043,7 @@ export default function AdminPage() {
                               <div className="admin-row-title">
                                 {item.title}
                                 <span className="scope-badge project">Project</span>
+                                {renderStatusBadge(item)}
                               </div>
                               <div className="admin-row-meta">
                                 {new Date(item.created_at).toLocaleString()} ·{" "}
@@ -997,6 +1063,7 @@ export default function AdminPage() {
                                   <span className="admin-path-missing">Path not set</span>
                                 )}
                               </div>
+                              {renderStatusError(item)}
                             </div>
                             <div className="admin-row-actions">
                               <button